@@ -2,22 +2,497 @@
 Pytest configuration and fixtures for BDD tests.
 """
 import pytest
-from playwright.sync_api import Page, Browser, BrowserContext
-from typing import Generator
+from playwright.async_api import async_playwright
+from playwright.sync_api import Page, Browser, BrowserContext, BrowserType
+from typing import Callable, Generator, Optional
+import asyncio
 import os
+from pathlib import Path
+from tests.utils.app_servers import AppServer, stop_all, worker_index
+from tests.utils.async_runner import AsyncRunner
+from tests.utils.browser_server import connect_options, ensure_browser_server
+from tests.utils.context_pool import ContextPool
+from tests.utils.har import HAR_DIR, NOT_FOUND_MODES, HarSession, har_path
+from tests.utils.locator_loader import DISK_CACHE_DIR, LocatorLoader
+from tests.utils.readiness import default_readiness
+from tests.utils.scheduling import DurationHistory, DurationScheduling, lpt_partition, parse_shard
+from tests.utils.static_server import StaticServer
+from tests.utils.request_filters import RequestFilter
+from tests.utils.storage_state import ensure_storage_state
+from tests.pages import AsyncBasePage, BasePage
+from tests.utils import timing
+from tests.utils.watcher import FileWatcher, watch_locators
 
 # Base URL for the application
 BASE_URL = os.getenv("BASE_URL", "http://localhost:5173")
 
+locator_watcher_key = pytest.StashKey[FileWatcher]()
+timeline_key = pytest.StashKey[timing.ActionTimeline]()
+_step_event_key = pytest.StashKey[dict]()
+duration_history_key = pytest.StashKey[DurationHistory]()
+app_server_key = pytest.StashKey[AppServer]()
+# nodeid -> seconds; on xdist the controller receives every worker's reports
+_durations_this_run: dict = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register command line options for the BDD suite."""
+    group = parser.getgroup("hai3", "HAI3 BDD suite")
+    group.addoption(
+        "--no-locator-preload",
+        action="store_true",
+        default=False,
+        help="Do not parse tests/locators/*.yaml at session start",
+    )
+    group.addoption(
+        "--watch-locators",
+        action="store_true",
+        default=False,
+        help="Hot-reload tests/locators/*.yaml when files change during the session",
+    )
+    group.addoption(
+        "--locator-store",
+        action="store_true",
+        default=False,
+        help="Compile locators once into a memory-mapped store shared by all xdist workers",
+    )
+    group.addoption(
+        "--context-pool",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Serve the page fixture from N pre-created, reused browser contexts (0 = off)",
+    )
+    group.addoption(
+        "--reuse-storage-state",
+        action="store_true",
+        default=False,
+        help="Bootstrap the app once per worker and seed every context with its storage state",
+    )
+    group.addoption(
+        "--refresh-storage-state",
+        action="store_true",
+        default=False,
+        help="Re-run the bootstrap even if a storage state snapshot for this build exists",
+    )
+    group.addoption(
+        "--request-filter",
+        action="append",
+        default=[],
+        metavar="PROFILE",
+        help="Abort or stub requests matching a request filter profile in every test (repeatable)",
+    )
+    group.addoption(
+        "--har-mode",
+        choices=("off", "record", "replay"),
+        default="off",
+        help="Record each test's traffic to a HAR, or replay it without a backend",
+    )
+    group.addoption(
+        "--har-dir",
+        default=str(HAR_DIR),
+        help="Directory holding recorded HARs (default: tests/hars)",
+    )
+    group.addoption(
+        "--har-not-found",
+        choices=NOT_FOUND_MODES,
+        default="abort",
+        help="What to do with requests missing from the HAR during replay",
+    )
+    group.addoption(
+        "--har-url",
+        default=None,
+        metavar="GLOB",
+        help="Only record/replay requests matching this URL glob (e.g. '**/api/**')",
+    )
+    group.addoption(
+        "--action-timing",
+        action="store_true",
+        default=False,
+        help="Record a per-test timeline of page object actions and steps (tests/.pytest_cache/timings)",
+    )
+    group.addoption(
+        "--shard",
+        default=None,
+        metavar="i/N",
+        help="Run only shard i of N, balanced by recorded test durations",
+    )
+    group.addoption(
+        "--duration-schedule",
+        action="store_true",
+        default=False,
+        help="Balance xdist workers by recorded test durations (longest first) instead of test count",
+    )
+    group.addoption(
+        "--app-servers",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Start (or reuse) one app server per K xdist workers on free ports (APP_SERVER_CMD)",
+    )
+    group.addoption(
+        "--keep-app-servers",
+        action="store_true",
+        default=False,
+        help="Leave --app-servers running after the session so the next run reuses them",
+    )
+    group.addoption(
+        "--serve-dist",
+        default=None,
+        metavar="PATH",
+        help="Serve a production build (e.g. dist/) from a local static server and test against it",
+    )
+    group.addoption(
+        "--reuse-browser-server",
+        action="store_true",
+        default=False,
+        help="Connect to a long-lived browser server (started on first use) instead of launching a browser",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Validate option combinations and prepare state shared by xdist workers."""
+    if config.getoption("--har-mode") == "record" and config.getoption("--context-pool"):
+        raise pytest.UsageError("--har-mode record needs a fresh context per test; drop --context-pool")
+
+    if config.getoption("--serve-dist") and config.getoption("--app-servers"):
+        raise pytest.UsageError("--serve-dist and --app-servers both set the app URL; use one")
+
+    if (config.getoption("--reuse-storage-state") and not config.getoption("--serve-dist")
+            and not os.getenv("APP_BUILD_ID") and not os.getenv("APP_SERVER_CWD")):
+        # A dev server's index HTML does not change with the sources
+        raise pytest.UsageError(
+            "--reuse-storage-state against a dev server needs APP_SERVER_CWD (the app's source "
+            "directory) or APP_BUILD_ID to tell when the snapshot is stale"
+        )
+
+    if config.getoption("--reuse-browser-server") and getattr(config.option, "numprocesses", None):
+        raise pytest.UsageError("--reuse-browser-server serves one client at a time; drop -n")
+
+    is_worker = hasattr(config, "workerinput")
+    if config.getoption("--action-timing") and not is_worker:
+        timing.reset_timelines()
+
+    parse_shard(config.getoption("--shard"))
+    if not is_worker:
+        config.stash[duration_history_key] = DurationHistory(config)
+
+    if config.getoption("--locator-store") and not is_worker:
+        try:
+            store_path = LocatorLoader.compile_store(DISK_CACHE_DIR / "store.bin")
+        except ValueError as e:
+            raise pytest.UsageError(str(e)) from e
+        # xdist workers are spawned later and inherit the environment
+        os.environ["LOCATOR_STORE"] = str(store_path)
+
+    if os.getenv("LOCATOR_STORE"):
+        LocatorLoader.use_store(os.environ["LOCATOR_STORE"])
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    """Parse every locator file up front so broken YAML fails before any test runs."""
+    # A compiled store was already validated when it was built
+    preload = not session.config.getoption("--no-locator-preload")
+    if preload and not os.getenv("LOCATOR_STORE"):
+        try:
+            LocatorLoader.preload()
+        except ValueError as e:
+            raise pytest.UsageError(str(e)) from e
+
+    if session.config.getoption("--watch-locators"):
+        session.config.stash[locator_watcher_key] = watch_locators()
+
+    per_server = session.config.getoption("--app-servers")
+    runs_tests = hasattr(session.config, "workerinput") or not getattr(session.config.option, "numprocesses", None)
+    if per_server and runs_tests:
+        server = AppServer(worker_index() // per_server)
+        try:
+            use_base_url(server.ensure())
+        except (RuntimeError, TimeoutError) as e:
+            raise pytest.UsageError(str(e)) from e
+        session.config.stash[app_server_key] = server
+
+
+def use_base_url(url: str) -> None:
+    """Point the base_url fixture, page objects and child processes at url."""
+    global BASE_URL
+    BASE_URL = BasePage.BASE_URL = AsyncBasePage.BASE_URL = url
+    os.environ["BASE_URL"] = url
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Stop the locator watcher and app servers, merge action timelines and save test durations."""
+    watcher = session.config.stash.get(locator_watcher_key, None)
+    if watcher is not None:
+        watcher.stop()
+
+    if session.config.getoption("--action-timing") and not hasattr(session.config, "workerinput"):
+        timing.merge_timelines()
+
+    history = session.config.stash.get(duration_history_key, None)
+    if history is not None and _durations_this_run:
+        for nodeid, seconds in _durations_this_run.items():
+            history.record(nodeid, seconds)
+        history.save()
+
+    if (session.config.getoption("--app-servers") and not session.config.getoption("--keep-app-servers")
+            and not hasattr(session.config, "workerinput")):
+        stop_all()
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list) -> None:
+    """Select this run's shard, balanced by recorded durations."""
+    shard = parse_shard(config.getoption("--shard"))
+    if not shard:
+        return
+
+    # Workers have no controller stash, but read the same cached history
+    history = config.stash.get(duration_history_key, None) or DurationHistory(config)
+    index, total = shard
+    keep = set(lpt_partition(history.estimates(items), total)[index - 1])
+    deselected = [item for item in items if item not in keep]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = [item for item in items if item in keep]
+
+
+@pytest.hookimpl(tryfirst=True, optionalhook=True)
+def pytest_xdist_make_scheduler(config: pytest.Config, log):
+    """With --duration-schedule, hand each xdist worker a bin of tests packed by duration."""
+    if config.getoption("--duration-schedule") and config.getvalue("dist") == "load":
+        return DurationScheduling(config, log, config.stash.get(duration_history_key, None))
+    return None
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    """Accumulate setup, call and teardown time per test for the duration history."""
+    _durations_this_run[report.nodeid] = _durations_this_run.get(report.nodeid, 0.0) + report.duration
+
+
+def pytest_bdd_before_step(request, feature, scenario, step, step_func) -> None:
+    """Start timing a BDD step."""
+    timeline = timing.active()
+    if timeline is not None:
+        request.node.stash[_step_event_key] = timeline.begin("step", f"{step.keyword} {step.name}")
+
+
+def pytest_bdd_after_step(request, feature, scenario, step, step_func, step_func_args) -> None:
+    """Finish timing a passed BDD step."""
+    timeline = timing.active()
+    event = request.node.stash.get(_step_event_key, None)
+    if timeline is not None and event is not None:
+        timeline.end(event)
+
+
+def pytest_bdd_step_error(request, feature, scenario, step, step_func, step_func_args, exception) -> None:
+    """Finish timing a failed BDD step."""
+    timeline = timing.active()
+    event = request.node.stash.get(_step_event_key, None)
+    if timeline is not None and event is not None:
+        timeline.end(event, type(exception).__name__)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    """Attach the test's action timeline to its pytest-html report."""
+    outcome = yield
+    report = outcome.get_result()
+    timeline = item.stash.get(timeline_key, None)
+    if timeline is None or report.when != "call":
+        return
+    try:
+        from pytest_html import extras
+    except ImportError:
+        return
+    report.extras = [*getattr(report, "extras", []), extras.json(timeline.to_dict(), name="Action timeline")]
+
+
+@pytest.fixture(autouse=True)
+def action_timeline(request: pytest.FixtureRequest) -> Generator:
+    """
+    Per-test timeline of page object actions and steps (None without --action-timing).
+
+    Finished timelines are appended to tests/.pytest_cache/timings/<worker>.jsonl
+    and merged into timeline.json at the end of the session.
+    """
+    if not request.config.getoption("--action-timing"):
+        yield None
+        return
+
+    timeline = timing.ActionTimeline(request.node.nodeid)
+    request.node.stash[timeline_key] = timeline
+    timing.activate(timeline)
+    yield timeline
+    timing.activate(None)
+    timing.write_timeline(timeline)
+
+
+@pytest.fixture(scope="session")
+def app_bootstrap() -> Callable[[Page], None]:
+    """
+    Steps that bring a freshly loaded app into its usual starting state.
+
+    Override in a conftest to log in or finish onboarding. With
+    --reuse-storage-state it runs once per worker and the resulting
+    storage state seeds every context.
+    """
+    def bootstrap(page: Page) -> None:
+        default_readiness().wait(page)
+
+    return bootstrap
+
 
 @pytest.fixture(scope="session")
-def browser_context_args(browser_context_args: dict) -> dict:
+def browser_context_args(browser_context_args: dict, request: pytest.FixtureRequest) -> dict:
     """Configure browser context with viewport and other settings."""
-    return {
+    args = {
         **browser_context_args,
         "viewport": {"width": 1920, "height": 1080},
         "ignore_https_errors": True,
     }
+    if request.config.getoption("--reuse-storage-state"):
+        state = ensure_storage_state(
+            request.getfixturevalue("browser"),
+            args,
+            BASE_URL,
+            request.getfixturevalue("app_bootstrap"),
+            refresh=request.config.getoption("--refresh-storage-state"),
+            source_dir=None if request.config.getoption("--serve-dist") else os.getenv("APP_SERVER_CWD"),
+        )
+        args["storage_state"] = str(state)
+    return args
+
+
+@pytest.fixture(scope="session")
+def browser(request: pytest.FixtureRequest, browser_type: BrowserType,
+            browser_type_launch_args: dict) -> Generator[Browser, None, None]:
+    """
+    The session browser.
+
+    Launched by pytest-playwright by default. With --reuse-browser-server it
+    is a connection to the persistent browser server, and closing it only
+    disconnects.
+    """
+    if request.config.getoption("--reuse-browser-server"):
+        try:
+            endpoint = ensure_browser_server(headless=browser_type_launch_args.get("headless", True))
+        except (RuntimeError, TimeoutError) as e:
+            raise pytest.UsageError(str(e)) from e
+        browser = browser_type.connect(**connect_options(endpoint, browser_type_launch_args))
+    else:
+        browser = request.getfixturevalue("launch_browser")()
+    yield browser
+    browser.close()
+
+
+@pytest.fixture(scope="session")
+def context_pool(request: pytest.FixtureRequest, browser: Browser,
+                 browser_context_args: dict) -> Generator[ContextPool, None, None]:
+    """Pool of ready browser contexts, sized by --context-pool."""
+    pool = ContextPool(browser, request.config.getoption("--context-pool"), browser_context_args)
+    pool.fill()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def page(request: pytest.FixtureRequest) -> Generator[Page, None, None]:
+    """
+    The page every test and step uses.
+
+    Comes from pytest-playwright's per-test context by default. With
+    --context-pool it is taken from the pool instead, and the pool is
+    refilled during teardown; pytest-playwright's tracing/video/screenshot
+    artifacts are then not collected.
+    """
+    if not request.config.getoption("--context-pool"):
+        yield request.getfixturevalue("context").new_page()
+        return
+
+    pool: ContextPool = request.getfixturevalue("context_pool")
+    pooled = pool.acquire()
+    yield pooled.page
+    pool.release(pooled)
+    pool.fill()
+
+
+@pytest.fixture(autouse=True)
+def request_filter(request: pytest.FixtureRequest) -> Generator:
+    """
+    Apply request filter profiles from --request-filter and @pytest.mark.request_filter.
+
+    Yields the active RequestFilter (or None); its stats are attached to the
+    test report as the "request_filter" user property.
+    """
+    names = list(request.config.getoption("--request-filter"))
+    for marker in request.node.iter_markers("request_filter"):
+        names.extend(marker.args)
+    if not names:
+        yield None
+        return
+
+    page: Page = request.getfixturevalue("page")
+    active = RequestFilter(names).install(page.context)
+    yield active
+    request.node.user_properties.append(("request_filter", active.stats))
+
+
+@pytest.fixture(autouse=True)
+def har(request: pytest.FixtureRequest) -> Generator:
+    """Record or replay the test's network traffic according to --har-mode."""
+    mode = request.config.getoption("--har-mode")
+    if mode == "off":
+        yield None
+        return
+
+    page: Page = request.getfixturevalue("page")
+    session = HarSession(
+        har_path(request.node, Path(request.config.getoption("--har-dir"))),
+        mode,
+        not_found=request.config.getoption("--har-not-found"),
+        url=request.config.getoption("--har-url"),
+    ).install(page.context)
+    yield session
+    if session.misses:
+        misses = "\n  ".join(session.misses)
+        pytest.fail(f"Requests missing from {session.path}:\n  {misses}")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def dist_server(request: pytest.FixtureRequest) -> Generator[Optional[StaticServer], None, None]:
+    """
+    Serve the --serve-dist build and point BASE_URL at it.
+
+    Each xdist worker runs its own server on a free port. Yields None
+    without --serve-dist.
+    """
+    dist = request.config.getoption("--serve-dist")
+    if not dist:
+        yield None
+        return
+
+    try:
+        server = StaticServer(dist).start()
+    except FileNotFoundError as e:
+        raise pytest.UsageError(str(e)) from e
+    use_base_url(server.url)
+    yield server
+    server.stop()
+
+
+@pytest.fixture(autouse=True)
+def app_server(request: pytest.FixtureRequest) -> Optional[AppServer]:
+    """Health-check this worker's --app-servers server, restarting it if it went down."""
+    server = request.config.stash.get(app_server_key, None)
+    if server is None:
+        return None
+    try:
+        url = server.check()
+    except (RuntimeError, TimeoutError) as e:
+        pytest.fail(str(e))
+    if url != BASE_URL:
+        use_base_url(url)
+    return server
 
 
 @pytest.fixture
@@ -31,3 +506,54 @@ def app_page(page: Page) -> Generator[Page, None, None]:
 def base_url() -> str:
     """Return the base URL for the application."""
     return BASE_URL
+
+
+@pytest.fixture(scope="session")
+def async_runner() -> Generator[AsyncRunner, None, None]:
+    """Event loop thread that runs async steps (see tests.utils.async_runner)."""
+    runner = AsyncRunner()
+    yield runner
+    runner.close()
+
+
+@pytest.fixture(scope="session")
+def async_browser(async_runner: AsyncRunner, browser_name: str, browser_type_launch_args: dict):
+    """A playwright.async_api browser launched with the same options as the sync one."""
+    async def launch():
+        playwright = await async_playwright().start()
+        browser = await playwright[browser_name].launch(**browser_type_launch_args)
+        return playwright, browser
+
+    async def stop():
+        await browser.close()
+        await playwright.stop()
+
+    playwright, browser = async_runner.run(launch())
+    yield browser
+    async_runner.run(stop())
+
+
+@pytest.fixture
+def async_page_factory(async_runner: AsyncRunner, async_browser,
+                       browser_context_args: dict) -> Generator[Callable, None, None]:
+    """
+    Coroutine factory that opens isolated pages concurrently.
+
+    Use from async steps: ``pages = await async_page_factory(3)``. Every page
+    gets its own context; all are closed after the test.
+    """
+    contexts = []
+
+    async def new_pages(count: int = 1) -> list:
+        new_contexts = await asyncio.gather(
+            *(async_browser.new_context(**browser_context_args) for _ in range(count))
+        )
+        contexts.extend(new_contexts)
+        return list(await asyncio.gather(*(context.new_page() for context in new_contexts)))
+
+    yield new_pages
+
+    async def close_all():
+        await asyncio.gather(*(context.close() for context in contexts))
+
+    async_runner.run(close_all())
@@ -1,4 +1,5 @@
 """Page objects package."""
+from tests.pages.async_base_page import AsyncBasePage
 from tests.pages.base_page import BasePage
 
-__all__ = ["BasePage"]
+__all__ = ["AsyncBasePage", "BasePage"]
@@ -0,0 +1,283 @@
+"""
+Asyncio counterpart of BasePage for playwright.async_api.
+
+Offers the same surface as BasePage with coroutine methods, so one process
+can drive many pages concurrently (e.g. multi-user chat scenarios).
+"""
+from playwright.async_api import Error, Page, Locator, expect
+from typing import Iterable, Optional
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlsplit
+from tests.pages.page_scripts import NAVIGATED, PLAYWRIGHT_ONLY_SELECTOR, QUERY_ELEMENTS, SPA_NAVIGATE
+from tests.utils.locator_loader import LocatorLoader
+from tests.utils.readiness import ReadinessStrategy, default_readiness
+from tests.utils.timing import note_retries, timed
+
+
+class AsyncBasePage:
+    """Base class for all asyncio page objects."""
+
+    BASE_URL = os.getenv("BASE_URL", "http://localhost:5173")
+
+    # See BasePage for the meaning of these settings
+    NAVIGATION_MODE = os.getenv("NAVIGATION_MODE", "full")
+    SPA_NAVIGATE_HOOK = "__APP_NAVIGATE__"
+    SPA_APP_ROOT = "#root"
+
+    # Override in subclass to specify the YAML file for locators
+    LOCATORS_YAML: Optional[str] = None
+    _locators: Optional[dict] = None
+
+    # Override in subclass to wait for an app-specific ready signal
+    READINESS: Optional[ReadinessStrategy] = None
+
+    def __init__(self, page: Page):
+        self.page = page
+        # Load locators from YAML if specified
+        if self.LOCATORS_YAML:
+            self._locators = LocatorLoader.get_all_synced_locators(self.LOCATORS_YAML)
+        # testid -> Locator; Locators are lazy and re-resolve on every action,
+        # so they stay valid across navigations
+        self._locator_memo: dict = {}
+        self._locator_hits = 0
+        self._locator_misses = 0
+
+    def invalidate_locators(self) -> None:
+        """Drop all memoized locators (e.g. after switching frames)."""
+        self._locator_memo.clear()
+
+    @property
+    def locator_cache_stats(self) -> dict:
+        """Hit/miss counters of the per-page locator memo."""
+        return {
+            "hits": self._locator_hits,
+            "misses": self._locator_misses,
+            "size": len(self._locator_memo),
+        }
+
+    @property
+    def url(self) -> str:
+        """Override in subclass to define the page URL path."""
+        return "/"
+
+    @property
+    def readiness(self) -> ReadinessStrategy:
+        """The readiness strategy used by navigate() and wait_for_load()."""
+        return self.READINESS or default_readiness()
+
+    @timed
+    async def navigate(self, mode: Optional[str] = None) -> "AsyncBasePage":
+        """
+        Navigate to the page URL.
+
+        Args:
+            mode: "full" or "spa" (defaults to NAVIGATION_MODE)
+        """
+        full_url = f"{self.BASE_URL}{self.url}"
+        if (mode or self.NAVIGATION_MODE) == "spa" and await self._navigate_in_app(full_url):
+            return self
+        await self.readiness.arm_async(self.page)
+        await self.page.goto(full_url)
+        return self
+
+    async def _navigate_in_app(self, full_url: str) -> bool:
+        """Route client-side if the app is booted on the same origin."""
+        target, current = urlsplit(full_url), urlsplit(self.page.url)
+        if (target.scheme, target.netloc) != (current.scheme, current.netloc):
+            return False
+        path = target.path or "/"
+        if target.query:
+            path += f"?{target.query}"
+        if target.fragment:
+            path += f"#{target.fragment}"
+        return await self.page.evaluate(SPA_NAVIGATE, {
+            "path": path,
+            "hook": self.SPA_NAVIGATE_HOOK,
+            "root": self.SPA_APP_ROOT,
+        })
+
+    @timed
+    async def wait_for_load(self, timeout: int = 30000,
+                            readiness: Optional[ReadinessStrategy] = None) -> "AsyncBasePage":
+        """Wait until the app signals it is ready (networkidle unless configured)."""
+        await (readiness or self.readiness).wait_async(self.page, timeout)
+        return self
+
+    @timed
+    def get_element(self, selector: str) -> Locator:
+        """Get a locator for an element by selector."""
+        return self.page.locator(selector)
+
+    @timed
+    def get_by_test_id(self, test_id: str) -> Locator:
+        """Get a locator for an element by data-testid attribute (memoized per page)."""
+        locator = self._locator_memo.get(test_id)
+        if locator is not None:
+            self._locator_hits += 1
+            return locator
+        self._locator_misses += 1
+        locator = self._locator_memo[test_id] = self.page.get_by_test_id(test_id)
+        return locator
+
+    @timed
+    def get_locator(self, locator_key: str) -> Locator:
+        """
+        Get a locator by key from the YAML file.
+        The key should match the key in the locators section (e.g., 'aqa_welcome_message').
+        """
+        if not self._locators:
+            raise ValueError(f"No LOCATORS_YAML specified for {self.__class__.__name__}")
+        testid = self._locators.get(locator_key)
+        if not testid:
+            raise ValueError(f"Locator key '{locator_key}' not found in {self.LOCATORS_YAML}")
+        return self.get_by_test_id(testid)
+
+    @timed
+    def get_by_role(self, role: str, name: Optional[str] = None) -> Locator:
+        """Get a locator for an element by ARIA role."""
+        if name:
+            return self.page.get_by_role(role, name=name)
+        return self.page.get_by_role(role)
+
+    @timed
+    def get_by_text(self, text: str, exact: bool = False) -> Locator:
+        """Get a locator for an element by text content."""
+        return self.page.get_by_text(text, exact=exact)
+
+    @timed
+    async def click(self, selector: str) -> "AsyncBasePage":
+        """Click an element by selector."""
+        await self.page.locator(selector).click()
+        return self
+
+    @timed
+    async def fill(self, selector: str, value: str) -> "AsyncBasePage":
+        """Fill an input field by selector."""
+        await self.page.locator(selector).fill(value)
+        return self
+
+    @timed
+    async def is_visible(self, selector: str, timeout: int = 5000) -> bool:
+        """Check if an element is visible, waiting up to timeout (see BasePage.is_visible)."""
+        try:
+            await self.page.locator(selector).wait_for(state="visible", timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    @timed
+    async def is_visible_now(self, target: str) -> bool:
+        """Check visibility from a single snapshot, without waiting."""
+        return await self.page.locator(self.css_selector(target)).first.is_visible()
+
+    @timed
+    async def is_visible_within(self, target: str, timeout: int = 500) -> bool:
+        """Check whether an element becomes visible within a short timeout, without raising."""
+        locator = self.page.locator(self.css_selector(target)).first
+        deadline = time.monotonic() + timeout / 1000
+        delay, polls = 8, 1
+        while not await locator.is_visible():
+            remaining = (deadline - time.monotonic()) * 1000
+            if remaining <= 0:
+                note_retries(polls - 1)
+                return False
+            await asyncio.sleep(min(delay, remaining) / 1000)
+            delay = min(delay * 2, 100)
+            polls += 1
+        note_retries(polls - 1)
+        return True
+
+    @timed
+    async def are_visible(self, targets: Iterable[str], timeout: int = 0) -> dict:
+        """Check visibility of many CSS targets in one round trip (see BasePage.are_visible)."""
+        targets = list(targets)
+        try:
+            outcome = await self.query_elements(targets, conditions={t: {"visible": True} for t in targets},
+                                                timeout=timeout)
+        except Error as e:
+            if NAVIGATED not in e.message:
+                raise
+            return dict.fromkeys(targets, False)
+        return {target: outcome["results"][target]["visible"] for target in targets}
+
+    @timed
+    async def wait_for_element(self, selector: str, timeout: int = 30000) -> Locator:
+        """Wait for an element to be visible and return its locator."""
+        locator = self.page.locator(selector)
+        await locator.wait_for(state="visible", timeout=timeout)
+        return locator
+
+    @timed
+    async def expect_visible(self, selector: str) -> None:
+        """Assert that an element is visible."""
+        await expect(self.page.locator(selector)).to_be_visible()
+
+    @timed
+    async def expect_text(self, selector: str, text: str) -> None:
+        """Assert that an element contains specific text."""
+        await expect(self.page.locator(selector)).to_contain_text(text)
+
+    def css_selector(self, target: str) -> str:
+        """Turn a locator key from LOCATORS_YAML into a data-testid CSS selector."""
+        testid = self._locators.get(target) if self._locators else None
+        if testid:
+            return f"[data-testid={json.dumps(testid)}]"
+        return target
+
+    @timed
+    async def query_elements(self, targets: Iterable[str], attributes: Iterable[str] = (),
+                             conditions: Optional[dict] = None, timeout: int = 0) -> dict:
+        """Inspect many elements in a single page.evaluate round trip (see BasePage.query_elements)."""
+        conditions = conditions or {}
+        targets = list(dict.fromkeys([*targets, *conditions]))
+        selectors = [[target, self.css_selector(target)] for target in targets]
+        for target, selector in selectors:
+            if PLAYWRIGHT_ONLY_SELECTOR.search(selector):
+                raise ValueError(f"'{target}' is not a CSS selector; in-page queries support CSS only")
+        attributes = set(attributes)
+        for condition in conditions.values():
+            attributes.update(condition.get("attributes", {}))
+        outcome = await self.page.evaluate(QUERY_ELEMENTS, {
+            "targets": selectors,
+            "attributes": sorted(attributes),
+            "conditions": conditions,
+            "timeout": timeout,
+        })
+        note_retries(outcome["polls"] - 1)
+        return outcome
+
+    @timed
+    async def expect_all(self, conditions: dict, timeout: int = 5000) -> dict:
+        """Assert many element conditions at once, polling in-page until all hold."""
+        normalized = {
+            target: {"visible": condition} if isinstance(condition, bool) else condition
+            for target, condition in conditions.items()
+        }
+        outcome = await self.query_elements(normalized, conditions=normalized, timeout=timeout)
+        if not outcome["ok"]:
+            details = "\n".join(
+                f"  {target}: expected {normalized[target]}, got {outcome['results'][target]}"
+                for target in outcome["failures"]
+            )
+            raise AssertionError(f"Conditions not met after {timeout}ms:\n{details}")
+        return outcome["results"]
+
+    @timed
+    async def expect_url_contains(self, path: str) -> None:
+        """Assert that the current URL contains a path."""
+        await expect(self.page).to_have_url(f"*{path}*")
+
+    @timed
+    async def take_screenshot(self, name: str) -> str:
+        """Take a screenshot and return the path."""
+        path = f"tests/screenshots/{name}.png"
+        await self.page.screenshot(path=path)
+        return path
+
+    @timed
+    async def get_title(self) -> str:
+        """Get the page title."""
+        return await self.page.title()
@@ -2,10 +2,16 @@
 Base Page Object class that all page objects inherit from.
 Provides common functionality for interacting with pages.
 """
-from playwright.sync_api import Page, Locator, expect
-from typing import Optional
+from playwright.sync_api import Error, Page, Locator, expect
+from typing import Iterable, Optional
+import json
 import os
+import time
+from urllib.parse import urlsplit
+from tests.pages.page_scripts import NAVIGATED, PLAYWRIGHT_ONLY_SELECTOR, QUERY_ELEMENTS, SPA_NAVIGATE
 from tests.utils.locator_loader import LocatorLoader
+from tests.utils.readiness import ReadinessStrategy, default_readiness
+from tests.utils.timing import note_retries, timed
 
 
 class BasePage:
@@ -13,40 +19,111 @@ class BasePage:
 
     BASE_URL = os.getenv("BASE_URL", "http://localhost:5173")
 
+    # "full" always loads the URL with page.goto; "spa" routes inside the
+    # already-booted app and only falls back to goto when it cannot
+    NAVIGATION_MODE = os.getenv("NAVIGATION_MODE", "full")
+    # Optional window function the app exposes for client-side routing
+    SPA_NAVIGATE_HOOK = "__APP_NAVIGATE__"
+    # Element the app renders into; empty means the app has not booted yet
+    SPA_APP_ROOT = "#root"
+
     # Override in subclass to specify the YAML file for locators
     LOCATORS_YAML: Optional[str] = None
     _locators: Optional[dict] = None
 
+    # Override in subclass to wait for an app-specific ready signal
+    # (defaults to tests.utils.readiness.default_readiness())
+    READINESS: Optional[ReadinessStrategy] = None
+
     def __init__(self, page: Page):
         self.page = page
         # Load locators from YAML if specified
         if self.LOCATORS_YAML:
             self._locators = LocatorLoader.get_all_synced_locators(self.LOCATORS_YAML)
+        # testid -> Locator; Locators are lazy and re-resolve on every action,
+        # so they stay valid across navigations
+        self._locator_memo: dict = {}
+        self._locator_hits = 0
+        self._locator_misses = 0
+
+    def invalidate_locators(self) -> None:
+        """Drop all memoized locators (e.g. after switching frames)."""
+        self._locator_memo.clear()
+
+    @property
+    def locator_cache_stats(self) -> dict:
+        """Hit/miss counters of the per-page locator memo."""
+        return {
+            "hits": self._locator_hits,
+            "misses": self._locator_misses,
+            "size": len(self._locator_memo),
+        }
 
     @property
     def url(self) -> str:
         """Override in subclass to define the page URL path."""
         return "/"
 
-    def navigate(self) -> "BasePage":
-        """Navigate to the page URL."""
+    @property
+    def readiness(self) -> ReadinessStrategy:
+        """The readiness strategy used by navigate() and wait_for_load()."""
+        return self.READINESS or default_readiness()
+
+    @timed
+    def navigate(self, mode: Optional[str] = None) -> "BasePage":
+        """
+        Navigate to the page URL.
+
+        Args:
+            mode: "full" or "spa" (defaults to NAVIGATION_MODE)
+        """
         full_url = f"{self.BASE_URL}{self.url}"
+        if (mode or self.NAVIGATION_MODE) == "spa" and self._navigate_in_app(full_url):
+            return self
+        self.readiness.arm(self.page)
         self.page.goto(full_url)
         return self
 
-    def wait_for_load(self, timeout: int = 30000) -> "BasePage":
-        """Wait for the page to be fully loaded."""
-        self.page.wait_for_load_state("networkidle", timeout=timeout)
+    def _navigate_in_app(self, full_url: str) -> bool:
+        """Route client-side if the app is booted on the same origin."""
+        target, current = urlsplit(full_url), urlsplit(self.page.url)
+        if (target.scheme, target.netloc) != (current.scheme, current.netloc):
+            return False
+        path = target.path or "/"
+        if target.query:
+            path += f"?{target.query}"
+        if target.fragment:
+            path += f"#{target.fragment}"
+        return self.page.evaluate(SPA_NAVIGATE, {
+            "path": path,
+            "hook": self.SPA_NAVIGATE_HOOK,
+            "root": self.SPA_APP_ROOT,
+        })
+
+    @timed
+    def wait_for_load(self, timeout: int = 30000,
+                      readiness: Optional[ReadinessStrategy] = None) -> "BasePage":
+        """Wait until the app signals it is ready (networkidle unless configured)."""
+        (readiness or self.readiness).wait(self.page, timeout)
         return self
 
+    @timed
     def get_element(self, selector: str) -> Locator:
         """Get a locator for an element by selector."""
         return self.page.locator(selector)
 
+    @timed
     def get_by_test_id(self, test_id: str) -> Locator:
-        """Get a locator for an element by data-testid attribute."""
-        return self.page.get_by_test_id(test_id)
+        """Get a locator for an element by data-testid attribute (memoized per page)."""
+        locator = self._locator_memo.get(test_id)
+        if locator is not None:
+            self._locator_hits += 1
+            return locator
+        self._locator_misses += 1
+        locator = self._locator_memo[test_id] = self.page.get_by_test_id(test_id)
+        return locator
 
+    @timed
     def get_locator(self, locator_key: str) -> Locator:
         """
         Get a locator by key from the YAML file.
@@ -57,60 +134,218 @@ class BasePage:
         testid = self._locators.get(locator_key)
         if not testid:
             raise ValueError(f"Locator key '{locator_key}' not found in {self.LOCATORS_YAML}")
-        return self.page.get_by_test_id(testid)
+        return self.get_by_test_id(testid)
 
+    @timed
     def get_by_role(self, role: str, name: Optional[str] = None) -> Locator:
         """Get a locator for an element by ARIA role."""
         if name:
             return self.page.get_by_role(role, name=name)
         return self.page.get_by_role(role)
 
+    @timed
     def get_by_text(self, text: str, exact: bool = False) -> Locator:
         """Get a locator for an element by text content."""
         return self.page.get_by_text(text, exact=exact)
 
+    @timed
     def click(self, selector: str) -> "BasePage":
         """Click an element by selector."""
         self.page.locator(selector).click()
         return self
 
+    @timed
     def fill(self, selector: str, value: str) -> "BasePage":
         """Fill an input field by selector."""
         self.page.locator(selector).fill(value)
         return self
 
+    @timed
     def is_visible(self, selector: str, timeout: int = 5000) -> bool:
-        """Check if an element is visible."""
+        """
+        Check if an element is visible, waiting up to timeout.
+
+        Accepts any Playwright selector. For negative checks prefer
+        is_visible_now() or is_visible_within(), which do not wait out the
+        full timeout through an exception.
+        """
         try:
             self.page.locator(selector).wait_for(state="visible", timeout=timeout)
             return True
         except Exception:
             return False
 
+    @timed
+    def is_visible_now(self, target: str) -> bool:
+        """
+        Check visibility from a single snapshot, without waiting.
+
+        Args:
+            target: Locator key or any Playwright selector
+        """
+        return self.page.locator(self.css_selector(target)).first.is_visible()
+
+    @timed
+    def is_visible_within(self, target: str, timeout: int = 500) -> bool:
+        """
+        Check whether an element becomes visible within a short timeout.
+
+        Polls locator.is_visible() with backoff (8 ms doubling to 100 ms) and
+        returns False on timeout instead of raising, so a negative answer
+        costs at most the timeout.
+
+        Args:
+            target: Locator key or any Playwright selector
+            timeout: Maximum time to wait, in ms
+        """
+        locator = self.page.locator(self.css_selector(target)).first
+        deadline = time.monotonic() + timeout / 1000
+        delay, polls = 8, 1
+        while not locator.is_visible():
+            remaining = (deadline - time.monotonic()) * 1000
+            if remaining <= 0:
+                note_retries(polls - 1)
+                return False
+            self.page.wait_for_timeout(min(delay, remaining))
+            delay = min(delay * 2, 100)
+            polls += 1
+        note_retries(polls - 1)
+        return True
+
+    @timed
+    def are_visible(self, targets: Iterable[str], timeout: int = 0) -> dict:
+        """
+        Check visibility of many elements in one round trip.
+
+        Args:
+            targets: Locator keys or CSS selectors
+            timeout: Keep polling up to this long (ms) until all are visible; 0 = one snapshot
+
+        Returns:
+            Dictionary of target -> bool; all False if the page navigates during the check
+
+        Raises:
+            ValueError: If a target is a Playwright-only selector (see query_elements)
+        """
+        targets = list(targets)
+        try:
+            outcome = self.query_elements(targets, conditions={t: {"visible": True} for t in targets},
+                                          timeout=timeout)
+        except Error as e:
+            if NAVIGATED not in e.message:
+                raise
+            return dict.fromkeys(targets, False)
+        return {target: outcome["results"][target]["visible"] for target in targets}
+
+    @timed
     def wait_for_element(self, selector: str, timeout: int = 30000) -> Locator:
         """Wait for an element to be visible and return its locator."""
         locator = self.page.locator(selector)
         locator.wait_for(state="visible", timeout=timeout)
         return locator
 
+    @timed
     def expect_visible(self, selector: str) -> None:
         """Assert that an element is visible."""
         expect(self.page.locator(selector)).to_be_visible()
 
+    @timed
     def expect_text(self, selector: str, text: str) -> None:
         """Assert that an element contains specific text."""
         expect(self.page.locator(selector)).to_contain_text(text)
 
+    def css_selector(self, target: str) -> str:
+        """
+        Turn a locator key from LOCATORS_YAML into a data-testid CSS selector.
+
+        Anything that is not a known key is returned unchanged. In-page
+        queries (query_elements, are_visible, expect_all) need it to be plain
+        CSS; Playwright-only engines such as text= do not work inside
+        page.evaluate.
+        """
+        testid = self._locators.get(target) if self._locators else None
+        if testid:
+            return f"[data-testid={json.dumps(testid)}]"
+        return target
+
+    @timed
+    def query_elements(self, targets: Iterable[str], attributes: Iterable[str] = (),
+                       conditions: Optional[dict] = None, timeout: int = 0) -> dict:
+        """
+        Inspect many elements in a single page.evaluate round trip.
+
+        Args:
+            targets: Locator keys or CSS selectors
+            attributes: Attribute names to read from each element
+            conditions: Optional {target: {"visible": bool, "text": str, "attributes": {...}}}
+                to poll for in-page
+            timeout: How long to keep polling for the conditions, in ms (0 = one snapshot)
+
+        Returns:
+            {"ok", "failures", "polls", "elapsed", "results"} where results maps each
+            target to {"count", "visible", "text", "attributes", "box"}
+
+        Raises:
+            ValueError: If a target is a Playwright-only selector (text=, role=, >>, ...)
+        """
+        conditions = conditions or {}
+        targets = list(dict.fromkeys([*targets, *conditions]))
+        selectors = [[target, self.css_selector(target)] for target in targets]
+        for target, selector in selectors:
+            if PLAYWRIGHT_ONLY_SELECTOR.search(selector):
+                raise ValueError(f"'{target}' is not a CSS selector; in-page queries support CSS only")
+        attributes = set(attributes)
+        for condition in conditions.values():
+            attributes.update(condition.get("attributes", {}))
+        outcome = self.page.evaluate(QUERY_ELEMENTS, {
+            "targets": selectors,
+            "attributes": sorted(attributes),
+            "conditions": conditions,
+            "timeout": timeout,
+        })
+        note_retries(outcome["polls"] - 1)
+        return outcome
+
+    @timed
+    def expect_all(self, conditions: dict, timeout: int = 5000) -> dict:
+        """
+        Assert many element conditions at once, polling in-page until all hold.
+
+        Args:
+            conditions: {target: True} for visible, {target: False} for hidden (a
+                missing element counts as hidden), or {target: {"visible": bool,
+                "text": str, "attributes": {...}}}; targets are locator keys or CSS selectors
+            timeout: Maximum time to wait for all conditions, in ms
+
+        Returns:
+            The per-target results of the final snapshot
+        """
+        normalized = {
+            target: {"visible": condition} if isinstance(condition, bool) else condition
+            for target, condition in conditions.items()
+        }
+        outcome = self.query_elements(normalized, conditions=normalized, timeout=timeout)
+        if not outcome["ok"]:
+            details = "\n".join(
+                f"  {target}: expected {normalized[target]}, got {outcome['results'][target]}"
+                for target in outcome["failures"]
+            )
+            raise AssertionError(f"Conditions not met after {timeout}ms:\n{details}")
+        return outcome["results"]
+
+    @timed
     def expect_url_contains(self, path: str) -> None:
         """Assert that the current URL contains a path."""
         expect(self.page).to_have_url(f"*{path}*")
 
+    @timed
     def take_screenshot(self, name: str) -> str:
         """Take a screenshot and return the path."""
         path = f"tests/screenshots/{name}.png"
         self.page.screenshot(path=path)
         return path
 
+    @timed
     def get_title(self) -> str:
         """Get the page title."""
         return self.page.title()
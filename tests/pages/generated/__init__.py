@@ -0,0 +1 @@
+"""Generated page locator modules."""
@@ -0,0 +1,102 @@
+"""
+In-page JavaScript used by page objects.
+
+Kept separate so the sync and async page objects evaluate the same code.
+"""
+import re
+
+# Selectors only Playwright understands: engine prefixes (text=, role=,
+# xpath=, internal:...), XPath, chaining and Playwright's pseudo-classes.
+# document.querySelectorAll cannot evaluate them.
+PLAYWRIGHT_ONLY_SELECTOR = re.compile(
+    r"^\s*(?:[a-z][\w:-]*=|//|\.\.)|>>"
+    r"|:(?:has-text|text|text-is|text-matches|visible|nth-match|left-of|right-of|above|below|near)\b"
+)
+# Playwright's error when the page navigates during an evaluation
+NAVIGATED = "Execution context was destroyed"
+
+# Snapshot (and optionally poll) many elements in one evaluation.
+#
+# arg = {
+#   targets:    [[name, cssSelector], ...],
+#   attributes: [attributeName, ...],
+#   conditions: {name: {visible?: bool, text?: str, attributes?: {attr: value}}},
+#   timeout:    milliseconds to keep polling until every condition holds (0 = one snapshot)
+# }
+#
+# Polling backs off from 8 ms to 100 ms between snapshots.
+# Resolves to {ok, failures: [name, ...], polls, elapsed, results: {name: {...}}}.
+# Visibility follows Playwright: a non-empty bounding box and no visibility:hidden.
+QUERY_ELEMENTS = """
+async ({targets, attributes, conditions, timeout}) => {
+  const isVisible = (el) => {
+    if (!el) return false;
+    if (getComputedStyle(el).visibility !== 'visible') return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+  };
+  const snapshot = () => {
+    const results = {};
+    for (const [name, selector] of targets) {
+      const elements = document.querySelectorAll(selector);
+      const el = elements[0];
+      const entry = {count: elements.length, visible: isVisible(el), text: null, attributes: {}, box: null};
+      if (el) {
+        entry.text = el.textContent;
+        for (const attr of attributes) entry.attributes[attr] = el.getAttribute(attr);
+        const rect = el.getBoundingClientRect();
+        entry.box = {x: rect.x, y: rect.y, width: rect.width, height: rect.height};
+      }
+      results[name] = entry;
+    }
+    return results;
+  };
+  const failing = (results) => Object.entries(conditions).filter(([name, cond]) => {
+    const el = results[name];
+    if (cond.visible !== undefined && el.visible !== cond.visible) return true;
+    if (cond.text !== undefined && !(el.text || '').includes(cond.text)) return true;
+    for (const [attr, value] of Object.entries(cond.attributes || {})) {
+      if (el.attributes[attr] !== value) return true;
+    }
+    return false;
+  }).map(([name]) => name);
+
+  const start = performance.now();
+  let polls = 0;
+  let delay = 8;
+  while (true) {
+    polls += 1;
+    const results = snapshot();
+    const failures = failing(results);
+    const elapsed = performance.now() - start;
+    if (!failures.length || elapsed >= timeout) {
+      return {ok: !failures.length, failures, polls, elapsed, results};
+    }
+    await new Promise((resolve) => setTimeout(resolve, Math.min(delay, timeout - elapsed)));
+    delay = Math.min(delay * 2, 100);
+  }
+}
+"""
+
+# Route inside an already-booted single-page app without reloading it.
+#
+# arg = {path, hook, root}: prefer window[hook](path) when the app exposes it,
+# otherwise pushState + popstate. Resolves to false when the app is not booted
+# (document still loading, or the root element has not rendered), so the
+# caller can fall back to a full page.goto().
+SPA_NAVIGATE = """
+({path, hook, root}) => {
+  if (document.readyState !== 'complete') return false;
+  if (typeof window[hook] === 'function') {
+    window[hook](path);
+    return true;
+  }
+  const appRoot = document.querySelector(root);
+  if (!appRoot || !appRoot.childElementCount) return false;
+  if (location.pathname + location.search + location.hash !== path) {
+    history.pushState(history.state, '', path);
+    window.dispatchEvent(new PopStateEvent('popstate', {state: history.state}));
+  }
+  return true;
+}
+"""
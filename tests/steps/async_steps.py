@@ -0,0 +1,58 @@
+"""
+Async step definitions for scenarios that drive several pages concurrently.
+
+Steps are ``async def`` coroutines wrapped with run_async, which runs them on
+the session's AsyncRunner; each user gets an isolated browser context.
+"""
+import asyncio
+from pytest_bdd import given, when, then, parsers
+from playwright.async_api import expect
+from tests.pages.async_base_page import AsyncBasePage
+from tests.utils.async_runner import run_async
+
+
+@given(parsers.parse("{count:d} users are on the application"), target_fixture="user_pages")
+@run_async
+async def users_on_application(async_page_factory, count: int) -> list:
+    """Open the application for several users at once."""
+    pages = await async_page_factory(count)
+    user_pages = [AsyncBasePage(page) for page in pages]
+    await asyncio.gather(*(user_page.navigate() for user_page in user_pages))
+    return user_pages
+
+
+@when(parsers.parse('every user navigates to "{path}"'))
+@run_async
+async def every_user_navigates(user_pages: list, base_url: str, path: str):
+    """Navigate every user's page to a path concurrently."""
+    await asyncio.gather(*(user_page.page.goto(f"{base_url}{path}") for user_page in user_pages))
+
+
+@when(parsers.parse('every user waits for the page to load'))
+@run_async
+async def every_user_waits_for_load(user_pages: list):
+    """Wait until the app is ready on every user's page."""
+    await asyncio.gather(*(user_page.wait_for_load() for user_page in user_pages))
+
+
+@when(parsers.parse('user {index:d} fills "{selector}" with "{value}"'))
+@run_async
+async def user_fills(user_pages: list, index: int, selector: str, value: str):
+    """Fill an input on one user's page (users are numbered from 1)."""
+    await user_pages[index - 1].fill(selector, value)
+
+
+@when(parsers.parse('user {index:d} clicks on "{selector}"'))
+@run_async
+async def user_clicks(user_pages: list, index: int, selector: str):
+    """Click an element on one user's page (users are numbered from 1)."""
+    await user_pages[index - 1].click(selector)
+
+
+@then(parsers.parse('every user should see "{text}"'))
+@run_async
+async def every_user_should_see(user_pages: list, text: str):
+    """Assert that text is visible on every user's page."""
+    await asyncio.gather(*(
+        expect(user_page.page.get_by_text(text).first).to_be_visible() for user_page in user_pages
+    ))
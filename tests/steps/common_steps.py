@@ -4,6 +4,7 @@ Common step definitions that can be reused across all feature tests.
 from pytest_bdd import given, when, then, parsers
 from playwright.sync_api import Page, expect
 from tests.pages.base_page import BasePage
+from tests.utils.readiness import default_readiness
 
 
 @given("I am on the application")
@@ -44,8 +45,8 @@ def type_into_field(page: Page, value: str, field_name: str):
 
 @when("I wait for the page to load")
 def wait_for_page_load(page: Page):
-    """Wait for the page to be fully loaded."""
-    page.wait_for_load_state("networkidle")
+    """Wait until the app signals it is ready (networkidle unless configured)."""
+    default_readiness().wait(page)
 
 
 @then(parsers.parse('I should see "{text}"'))
@@ -0,0 +1 @@
+"""Unit tests for the suite's utilities (no browser needed)."""
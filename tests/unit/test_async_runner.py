@@ -0,0 +1,87 @@
+"""
+run_async: async step definitions executed by pytest-bdd.
+"""
+import inspect
+from pathlib import Path
+
+from tests.utils.async_runner import AsyncRunner, run_async
+
+pytest_plugins = ["pytester"]
+
+FEATURE = """\
+Feature: Async steps
+    Scenario: Async steps get fixtures, step arguments and results
+        Given 3 users
+        When every user counts to "5"
+        Then the total is 15
+"""
+
+STEPS = """\
+import asyncio
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from tests.utils.async_runner import AsyncRunner, run_async
+
+scenarios("async.feature")
+
+
+@pytest.fixture(scope="session")
+def async_runner():
+    runner = AsyncRunner()
+    yield runner
+    runner.close()
+
+
+@pytest.fixture
+def offset():
+    return 0
+
+
+@given(parsers.parse("{count:d} users"), target_fixture="users")
+@run_async
+async def users(count: int):
+    await asyncio.sleep(0)
+    return list(range(count))
+
+
+@when(parsers.parse('every user counts to "{limit:d}"'), target_fixture="total")
+@run_async
+async def count(users, offset, limit: int, async_runner):
+    assert asyncio.get_running_loop() is async_runner.loop
+    return offset + len(users) * limit
+
+
+@then(parsers.parse("the total is {expected:d}"))
+@run_async
+async def check_total(total, expected: int):
+    assert total == expected
+"""
+
+
+def test_run_async_steps_run_under_pytest_bdd(pytester, monkeypatch):
+    pytester.makefile(".feature", **{"async": FEATURE})
+    pytester.makepyfile(test_async_steps=STEPS)
+    # The generated module imports tests.utils from this repository
+    monkeypatch.setenv("PYTHONPATH", str(Path(__file__).resolve().parents[2]))
+    result = pytester.runpytest_subprocess("-p", "no:cacheprovider")
+    result.assert_outcomes(passed=1)
+
+
+def test_runner_is_a_required_positional_or_keyword_parameter():
+    @run_async
+    async def step(user_pages, path: str, *rest, flag: bool = False, **kwargs):
+        return user_pages, path, rest, flag, kwargs
+
+    parameters = inspect.signature(step).parameters
+    assert list(parameters) == ["user_pages", "path", "async_runner", "rest", "flag", "kwargs"]
+    assert parameters["async_runner"].kind is inspect.Parameter.POSITIONAL_OR_KEYWORD
+    assert parameters["async_runner"].default is inspect.Parameter.empty
+
+    runner = AsyncRunner()
+    try:
+        assert step(1, "/a", runner, 2, flag=True, extra=3) == (1, "/a", (2,), True, {"extra": 3})
+        assert step(user_pages=1, path="/b", async_runner=runner) == (1, "/b", (), False, {})
+    finally:
+        runner.close()
@@ -0,0 +1,156 @@
+"""
+Equivalence of the streaming locator parser and the compiled store with a
+full yaml.safe_load of the same document.
+"""
+import pytest
+import yaml
+
+from tests.utils import locator_loader
+from tests.utils.locator_loader import LocatorLoader, parse_synced_locators, synced_from_document
+from tests.utils.locator_store import LocatorStore, compile_store
+
+DOCUMENTS = {
+    "plain": """
+source: src/Chat.tsx
+locators:
+  aqa_send:
+    testid: chat-send
+    component: Button
+  aqa_input:
+    testid: chat-input
+""",
+    "metadata_with_anchors": """
+meta: &meta
+  owners: [a, b]
+  nested: {deep: [1, 2, {x: y}]}
+other: *meta
+locators:
+  aqa_send: {testid: chat-send, line: 12}
+""",
+    "alias_entry": """
+shared: &entry
+  testid: shared-id
+locators:
+  aqa_one: *entry
+  aqa_two: {testid: two}
+""",
+    "alias_testid": """
+ids:
+  send: &send chat-send
+locators:
+  aqa_send: {testid: *send}
+""",
+    "merge_key_in_entry": """
+base: &base {testid: base-id, component: Button}
+locators:
+  aqa_send:
+    <<: *base
+    line: 3
+""",
+    "merge_key_in_locators": """
+more: &more
+  aqa_extra: {testid: extra}
+locators:
+  <<: *more
+  aqa_send: {testid: chat-send}
+""",
+    "null_entries": """
+locators:
+  aqa_null: ~
+  aqa_empty: {}
+  aqa_no_testid: {component: Button}
+  aqa_null_testid: {testid: null}
+  aqa_send: {testid: chat-send}
+""",
+    "null_locators": """
+source: x
+locators:
+""",
+    "no_locators": """
+source: x
+""",
+    "non_str_scalars": """
+locators:
+  1: {testid: 2}
+  aqa_bool: {testid: true}
+  aqa_float: {testid: 1.5}
+  aqa_str_tag: {testid: !!str 123}
+""",
+    "duplicate_locators_section": """
+locators:
+  a: {testid: x}
+locators:
+  b: {testid: y}
+""",
+    "duplicate_entry": """
+locators:
+  a: {testid: x}
+  a: {testid: y}
+""",
+    "duplicate_entry_null_last": """
+locators:
+  a: {testid: x}
+  a: ~
+""",
+    "duplicate_testid_field": """
+locators:
+  a: {testid: x, testid: y}
+""",
+    "quoted_and_block_scalars": """
+locators:
+  "aqa quoted": {testid: 'single'}
+  aqa_block:
+    testid: >-
+      folded
+      text
+""",
+}
+
+
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+def test_stream_parse_matches_full_parse(name):
+    text = DOCUMENTS[name]
+    assert parse_synced_locators(text) == synced_from_document(yaml.safe_load(text))
+
+
+@pytest.mark.parametrize("name", sorted(
+    name for name, text in DOCUMENTS.items()
+    if all(isinstance(k, str) and (v is None or isinstance(v, str))
+           for k, v in synced_from_document(yaml.safe_load(text)).items())
+))
+def test_store_matches_full_parse(name, tmp_path):
+    expected = synced_from_document(yaml.safe_load(DOCUMENTS[name]))
+    store = LocatorStore(compile_store({"file.yaml": expected, "other.yaml": {"a": "other"}},
+                                       tmp_path / "store.bin"))
+    try:
+        view = store.get_locators("file.yaml")
+        assert dict(view) == expected
+        for key, testid in expected.items():
+            assert key in view
+            assert view.get(key) == testid
+        assert "missing" not in view
+    finally:
+        store.close()
+
+
+def test_store_rejects_non_string_values(tmp_path):
+    with pytest.raises(ValueError):
+        compile_store({"file.yaml": {1: "x"}}, tmp_path / "store.bin")
+    with pytest.raises(ValueError):
+        compile_store({"file.yaml": {"a": 2}}, tmp_path / "store.bin")
+
+
+def test_loader_keeps_non_string_files_out_of_the_store(tmp_path, monkeypatch):
+    # Keep parse caches for these throwaway files out of tests/.pytest_cache
+    monkeypatch.setattr(locator_loader, "DISK_CACHE_DIR", tmp_path / "cache")
+    strings = tmp_path / "strings.yaml"
+    strings.write_text(DOCUMENTS["plain"], encoding="utf-8")
+    numbers = tmp_path / "numbers.yaml"
+    numbers.write_text(DOCUMENTS["non_str_scalars"], encoding="utf-8")
+    try:
+        store = LocatorStore(LocatorLoader.compile_store(tmp_path / "store.bin", [str(strings), str(numbers)]))
+        assert str(strings.resolve()) in store
+        assert str(numbers.resolve()) not in store
+        store.close()
+    finally:
+        LocatorLoader.clear_cache()
@@ -0,0 +1,22 @@
+"""
+Which selectors the in-page queries accept.
+"""
+import pytest
+
+from tests.pages.page_scripts import PLAYWRIGHT_ONLY_SELECTOR
+
+
+@pytest.mark.parametrize("selector", [
+    "text=Error", "role=button[name='Save']", "xpath=//a", "//div", "div >> span",
+    "internal:role=button", 'button:has-text("Save")', "li:visible", "..",
+])
+def test_playwright_only_selectors_are_detected(selector):
+    assert PLAYWRIGHT_ONLY_SELECTOR.search(selector)
+
+
+@pytest.mark.parametrize("selector", [
+    '[data-testid="save"]', "a[href=x]", "input:checked", "div.cls > p:nth-child(2)",
+    "#id", "input:not([type=hidden])", "ul li + li",
+])
+def test_css_selectors_pass(selector):
+    assert not PLAYWRIGHT_ONLY_SELECTOR.search(selector)
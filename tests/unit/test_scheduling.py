@@ -0,0 +1,84 @@
+"""
+Duration scheduling: which tests each xdist worker is sent.
+"""
+import pytest
+
+from tests.utils.scheduling import DurationHistory, DurationScheduling, history_key
+
+pytest.importorskip("xdist")
+
+
+class FakeConfig:
+    """Just enough of pytest.Config for LoadScheduling with -n 2."""
+
+    def getvalue(self, name):
+        return {"tx": ["2*popen"]}[name]
+
+    def getoption(self, name):
+        return {"maxschedchunk": None}[name]
+
+
+class FakeNode:
+    def __init__(self, name: str):
+        self.gateway = type("Gateway", (), {"id": name})()
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+COLLECTION = [
+    "tests/test_a.py::test_slow",
+    "tests/test_a.py::test_fast",
+    "tests/test_b.py::test_medium",
+    "tests/test_b.py::test_quick",
+    "tests/test_b.py::test_new",
+]
+
+
+def schedule(durations: dict) -> list:
+    config = FakeConfig()
+    history = DurationHistory(config)
+    history.durations = durations
+    scheduler = DurationScheduling(config, history=history)
+    nodes = [FakeNode("gw0"), FakeNode("gw1")]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, COLLECTION)
+    scheduler.schedule()
+    assert all(node.shutting_down for node in nodes)
+    return [[COLLECTION[index] for index in node.sent] for node in nodes]
+
+
+def test_workers_receive_longest_first_bins_in_collection_order():
+    bins = schedule({
+        "tests/test_a.py::test_slow": 10.0,
+        "tests/test_a.py::test_fast": 1.0,
+        "tests/test_b.py::test_medium": 6.0,
+        "tests/test_b.py::test_quick": 2.0,
+    })
+    # test_new has no history and is estimated from test_b.py's mean (4s)
+    # slow 10 | medium 6 + new 4 | quick 2 onto the first tie | fast 1 onto the lighter bin
+    assert bins == [
+        ["tests/test_a.py::test_slow", "tests/test_b.py::test_quick"],
+        ["tests/test_a.py::test_fast", "tests/test_b.py::test_medium", "tests/test_b.py::test_new"],
+    ]
+
+
+def test_every_test_is_sent_exactly_once():
+    bins = schedule({})
+    assert sorted(bins[0] + bins[1]) == sorted(COLLECTION)
+
+
+def test_history_ignores_loadgroup_suffix():
+    history = DurationHistory(FakeConfig())
+    history.record("tests/test_a.py::test_slow@group", 3.0)
+    assert history.durations == {"tests/test_a.py::test_slow": 3.0}
+    assert history.estimates(["tests/test_a.py::test_slow@group"]) == {
+        "tests/test_a.py::test_slow@group": 3.0
+    }
+    assert history_key("tests/test_a.py::test_x[a@b]") == "tests/test_a.py::test_x[a@b]"
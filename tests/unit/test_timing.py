@@ -0,0 +1,64 @@
+"""
+Action timelines: nesting of sequential and concurrent page object actions.
+"""
+import asyncio
+
+import pytest
+
+from tests.utils import timing
+from tests.utils.async_runner import AsyncRunner
+
+
+class FakePage:
+    @timing.timed
+    def click(self, target: str) -> None:
+        self.fill(target)
+
+    @timing.timed
+    def fill(self, target: str) -> None:
+        timing.note_retries(2)
+
+    @timing.timed
+    async def navigate(self, target: str, polls: int) -> None:
+        await asyncio.sleep(0.01)
+        timing.note_retries(polls)
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def timeline():
+    timeline = timing.ActionTimeline("test")
+    timing.activate(timeline)
+    yield timeline
+    timing.activate(None)
+
+
+def summary(timeline: timing.ActionTimeline) -> list:
+    return [(e["action"], e["target"], e["depth"], e["retries"]) for e in timeline.events]
+
+
+def test_sequential_actions_nest(timeline):
+    FakePage().click("#save")
+    assert summary(timeline) == [("click", "#save", 0, 0), ("fill", "#save", 1, 2)]
+
+
+def test_concurrent_actions_are_siblings(timeline):
+    page = FakePage()
+
+    async def step():
+        await asyncio.gather(page.navigate("/a", 1), page.navigate("/b", 5))
+
+    runner = AsyncRunner()
+    event = timeline.begin("step", "When every user navigates")
+    try:
+        runner.run(step())
+    finally:
+        runner.close()
+    timeline.end(event)
+
+    assert summary(timeline) == [
+        ("When every user navigates", None, 0, 0),
+        ("navigate", "/a", 1, 1),
+        ("navigate", "/b", 1, 5),
+    ]
+    assert timeline.to_dict()["total_ms"] == pytest.approx(event["duration_ms"])
@@ -0,0 +1,58 @@
+"""
+Watch runner dependency graph: which tests a change selects.
+"""
+import pytest
+
+from tests.utils import watch_runner
+from tests.utils.watch_runner import DependencyGraph, affected
+
+FILES = {
+    "conftest.py": "from tests.utils.har import HarSession\n",
+    "utils/__init__.py": "",
+    "utils/har.py": "from tests.utils import timing\n",
+    "utils/timing.py": "",
+    "utils/helpers.py": "",
+    "pages/__init__.py": "",
+    "pages/login_page.py": (
+        "from typing import Optional\n"
+        "from tests.utils.helpers import wait\n"
+        "class LoginPage:\n"
+        "    LOCATORS_YAML: Optional[str] = 'login.yaml'\n"
+    ),
+    "pages/other_page.py": "class OtherPage:\n    LOCATORS_YAML = 'other.yaml'\n",
+    "test_login.py": "from tests.pages.login_page import LoginPage\n",
+    "test_other.py": "from tests.pages.other_page import OtherPage\n",
+}
+
+
+@pytest.fixture
+def graph(tmp_path, monkeypatch):
+    root = tmp_path / "tests"
+    for name, source in FILES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+    monkeypatch.setattr(watch_runner, "TESTS_DIR", root)
+    monkeypatch.setattr(watch_runner, "STEPS_DIR", root / "steps")
+    return DependencyGraph(root).build()
+
+
+@pytest.mark.parametrize("changed", ["conftest.py", "utils/har.py", "utils/timing.py"])
+def test_conftest_and_its_imports_select_everything(graph, changed):
+    selection = affected([graph.root / changed], graph, graph)
+    assert selection.everything
+
+
+def test_other_modules_select_their_importers(graph):
+    selection = affected([graph.root / "utils/helpers.py"], graph, graph)
+    assert not selection.everything
+    assert selection.modules == {str(graph.root / "test_login.py")}
+
+
+@pytest.mark.parametrize("locators, test_module", [
+    ("login.yaml", "test_login.py"),
+    ("other.yaml", "test_other.py"),
+])
+def test_locator_files_select_pages_with_plain_and_annotated_assignments(graph, locators, test_module):
+    selection = affected([graph.root / "locators" / locators], graph, graph)
+    assert selection.modules == {str(graph.root / test_module)}
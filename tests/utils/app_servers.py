@@ -0,0 +1,237 @@
+"""
+Per-Worker App Servers
+
+Starts a pool of app dev servers for parallel runs, one per K xdist workers,
+so the workers do not all share a single Vite server. Worker gwN uses slot
+N // K. Whichever worker of a slot gets there first picks a free port and
+starts the server. The others reuse it through a state file in
+tests/.pytest_cache/app_servers. A server that is still healthy from an
+earlier run is reused as well.
+
+A server that goes down mid-run is restarted on the same port, because
+session-scoped fixtures (base_url, browser_context_args) keep the URL they
+saw first. State files record the server's start time next to its pid, and
+a pid is only signalled while it still belongs to that process.
+
+The command is APP_SERVER_CMD (default "npm run dev -- --port {port}
+--strictPort"), run in APP_SERVER_CWD (default: the current directory).
+"""
+import json
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+SERVER_DIR = Path(__file__).parent.parent / ".pytest_cache" / "app_servers"
+DEFAULT_COMMAND = "npm run dev -- --port {port} --strictPort"
+# Seconds between health checks of a running server
+HEALTH_INTERVAL = 5.0
+# Seconds to wait for a stopped server to release its port
+PORT_RELEASE_TIMEOUT = 10.0
+
+
+def worker_index() -> int:
+    """Number of the current xdist worker (0 without xdist)."""
+    worker = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+    return int(worker[2:]) if worker[2:].isdigit() else 0
+
+
+def free_port() -> int:
+    """Ask the OS for a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def port_free(port: int) -> bool:
+    """Return True if nothing listens on this localhost port."""
+    with socket.socket() as sock:
+        if os.name == "posix":
+            # Connections of a stopped server in TIME_WAIT do not block a new one
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(("127.0.0.1", port))
+        except OSError:
+            return False
+        return True
+
+
+def is_healthy(url: str, timeout: float = 2.0) -> bool:
+    """Return True if the server answers with anything but a 5xx."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout):
+            return True
+    except urllib.error.HTTPError as e:
+        return e.code < 500
+    except (OSError, ValueError):
+        return False
+
+
+def process_start_time(pid: int) -> Optional[str]:
+    """When pid started, as an opaque string; None if it is not running or this cannot be told."""
+    if Path("/proc/self/stat").exists():
+        try:
+            # Fields 3 (state) and 22 (start time), counted after the parenthesised command name
+            fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            return None
+        return None if fields[0] in ("Z", "X") else fields[19]
+    try:
+        result = subprocess.run(["ps", "-o", "lstart=", "-p", str(pid)],
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def same_process(pid: int, started: Optional[str]) -> bool:
+    """Return True if pid is still the process recorded with this start time (pids get reused)."""
+    return started is not None and process_start_time(pid) == started
+
+
+def kill_process(pid: int) -> None:
+    """Stop a process started in its own session, with everything it spawned."""
+    try:
+        if os.name == "posix":
+            os.killpg(pid, signal.SIGTERM)
+        else:
+            os.kill(pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+@contextmanager
+def file_lock(lock: Path, timeout: float = 120.0):
+    """Cross-process exclusive lock on a lock file."""
+    lock.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            # A lock older than the timeout belongs to a crashed process
+            try:
+                if time.time() - lock.stat().st_mtime > timeout:
+                    lock.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock}")
+            time.sleep(0.1)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        lock.unlink(missing_ok=True)
+
+
+class AppServer:
+    """One app server slot shared by a group of workers."""
+
+    def __init__(self, slot: int, command: Optional[str] = None, cwd: Optional[str] = None,
+                 startup_timeout: float = 60.0, server_dir: Path = SERVER_DIR):
+        self.slot = slot
+        self.command = command or os.getenv("APP_SERVER_CMD", DEFAULT_COMMAND)
+        self.cwd = cwd or os.getenv("APP_SERVER_CWD") or None
+        self.startup_timeout = startup_timeout
+        self.state_file = server_dir / f"slot-{slot}.json"
+        self.log_file = server_dir / f"slot-{slot}.log"
+        self.url: Optional[str] = None
+        self._checked_at = 0.0
+
+    def _read_state(self) -> Optional[dict]:
+        try:
+            return json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def ensure(self) -> str:
+        """Return the URL of a healthy server for this slot, starting one if needed."""
+        # Only one worker of the slot may start the server
+        with file_lock(self.state_file.with_suffix(".lock")):
+            state = self._read_state()
+            running = bool(state) and same_process(state["pid"], state.get("started"))
+            if running and is_healthy(state["url"]):
+                self.url = state["url"]
+            else:
+                if running:
+                    kill_process(state["pid"])
+                self.url = self._start(self._port(state))
+        self._checked_at = time.monotonic()
+        return self.url
+
+    def _port(self, state: Optional[dict]) -> int:
+        """The port this worker already uses, else the recorded one if free, else any free port."""
+        if self.url is None:
+            recorded = (state or {}).get("port")
+            return recorded if recorded and port_free(recorded) else free_port()
+        port = urlsplit(self.url).port
+        deadline = time.monotonic() + PORT_RELEASE_TIMEOUT
+        while not port_free(port):
+            if time.monotonic() > deadline:
+                raise RuntimeError(
+                    f"Cannot restart the app server for slot {self.slot}: port {port} is still in use"
+                )
+            time.sleep(0.25)
+        return port
+
+    def _start(self, port: int) -> str:
+        url = f"http://localhost:{port}"
+        args = shlex.split(self.command.format(port=port), posix=os.name == "posix")
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_file, "ab") as log:
+            process = subprocess.Popen(
+                args,
+                cwd=self.cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                # Own process group, so stop() also ends the spawned node process
+                start_new_session=os.name == "posix",
+                shell=sys.platform == "win32",
+            )
+
+        deadline = time.monotonic() + self.startup_timeout
+        while not is_healthy(url):
+            if process.poll() is not None or time.monotonic() > deadline:
+                kill_process(process.pid)
+                raise RuntimeError(
+                    f"App server for slot {self.slot} did not come up on {url}; see {self.log_file}"
+                )
+            time.sleep(0.25)
+
+        state = {"pid": process.pid, "started": process_start_time(process.pid), "port": port, "url": url}
+        self.state_file.write_text(json.dumps(state), encoding="utf-8")
+        return url
+
+    def check(self) -> str:
+        """Health-check the server (at most every HEALTH_INTERVAL seconds), restarting it if down."""
+        if self.url and time.monotonic() - self._checked_at < HEALTH_INTERVAL:
+            return self.url
+        if self.url and is_healthy(self.url):
+            self._checked_at = time.monotonic()
+            return self.url
+        return self.ensure()
+
+
+def stop_all(server_dir: Path = SERVER_DIR) -> None:
+    """Stop every server recorded in server_dir."""
+    for state_file in server_dir.glob("slot-*.json"):
+        try:
+            state = json.loads(state_file.read_text(encoding="utf-8"))
+            if same_process(state["pid"], state.get("started")):
+                kill_process(state["pid"])
+        except (ValueError, KeyError):
+            pass
+        state_file.unlink(missing_ok=True)
@@ -0,0 +1,69 @@
+"""
+Async Runner Utility
+
+Runs coroutines on a dedicated event loop thread so synchronous pytest-bdd
+steps can drive playwright.async_api pages. The loop lives outside the main
+thread, so it does not clash with the loop pytest-playwright's sync API uses.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+
+class AsyncRunner:
+    """An event loop running in a background thread."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-runner", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block until it returns."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def close(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+def run_async(func: Callable[..., Awaitable]) -> Callable:
+    """
+    Adapt an ``async def`` step to pytest-bdd.
+
+    The returned function has the coroutine's signature plus an
+    ``async_runner`` fixture argument, so pytest-bdd injects fixtures and
+    step arguments as usual and the coroutine runs on the shared runner:
+
+        @when(parsers.parse('every user navigates to "{path}"'))
+        @run_async
+        async def every_user_navigates(user_pages, path): ...
+    """
+    signature = original = inspect.signature(func)
+    needs_runner = "async_runner" in signature.parameters
+    if not needs_runner:
+        # pytest-bdd only injects required positional-or-keyword arguments, so the
+        # runner goes before the first parameter with a default or of another kind
+        params = list(signature.parameters.values())
+        position = next(
+            (index for index, param in enumerate(params)
+             if param.kind is not inspect.Parameter.POSITIONAL_OR_KEYWORD
+             or param.default is not inspect.Parameter.empty),
+            len(params),
+        )
+        params.insert(position, inspect.Parameter("async_runner", inspect.Parameter.POSITIONAL_OR_KEYWORD))
+        signature = signature.replace(parameters=params)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+        runner = arguments["async_runner"] if needs_runner else arguments.pop("async_runner")
+        call = inspect.BoundArguments(original, arguments)
+        return runner.run(func(*call.args, **call.kwargs))
+
+    wrapper.__signature__ = signature
+    return wrapper
@@ -0,0 +1,177 @@
+"""
+Persistent Browser Server
+
+Keeps a Playwright browser server running between pytest invocations, so an
+edit-run loop does not pay for starting the driver and the browser each time.
+
+Playwright for Python has no launch_server(), so the server is the driver's
+own `playwright run-server` in extension mode. In that mode one browser per
+browser type and launch options stays open across connections, and contexts
+are closed when a client disconnects. The endpoint, pid and its start time,
+Playwright version and headless flag are kept in
+tests/.pytest_cache/browser_server.json. A
+server that died, or that was started by a different Playwright version or
+with another headless setting, is replaced automatically.
+
+Usage:
+    pytest tests/ --reuse-browser-server
+    python -m tests.utils.browser_server stop
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from importlib.metadata import version
+from pathlib import Path
+from typing import Optional
+
+from tests.utils.app_servers import file_lock, free_port, kill_process, process_start_time, same_process
+
+STATE_FILE = Path(__file__).parent.parent / ".pytest_cache" / "browser_server.json"
+LAUNCH_OPTIONS_HEADER = "x-playwright-launch-options"
+
+
+def playwright_version() -> str:
+    return version("playwright")
+
+
+def _listening(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+def _read_state(state_file: Path) -> Optional[dict]:
+    try:
+        return json.loads(state_file.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _is_running(state: Optional[dict]) -> bool:
+    """Whether the recorded server process still exists (and its pid was not reused)."""
+    return bool(state) and same_process(state["pid"], state.get("started"))
+
+
+def _is_usable(state: Optional[dict], headless: bool) -> bool:
+    return bool(
+        _is_running(state)
+        and state.get("version") == playwright_version()
+        and state.get("headless") == headless
+        and _listening(state["port"])
+    )
+
+
+def ensure_browser_server(headless: bool = True, state_file: Path = STATE_FILE,
+                          startup_timeout: float = 30.0) -> str:
+    """
+    Return the websocket endpoint of a running browser server, launching one if needed.
+
+    Args:
+        headless: Whether the server's browsers run headless
+        state_file: Where the endpoint and server details are kept
+        startup_timeout: Seconds to wait for a new server to listen
+
+    Returns:
+        The ws:// endpoint for BrowserType.connect()
+    """
+    with file_lock(state_file.with_suffix(".lock")):
+        state = _read_state(state_file)
+        if _is_usable(state, headless):
+            return state["endpoint"]
+        if _is_running(state):
+            kill_process(state["pid"])
+
+        port = free_port()
+        env = dict(os.environ)
+        if headless:
+            env["PW_DEBUG_CONTROLLER_HEADLESS"] = "1"
+        else:
+            env.pop("PW_DEBUG_CONTROLLER_HEADLESS", None)
+        log_file = state_file.with_suffix(".log")
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_file, "ab") as log:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "playwright", "run-server",
+                 "--host", "127.0.0.1", "--port", str(port), "--mode", "extension"],
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                # Outlive this pytest run
+                start_new_session=os.name == "posix",
+                creationflags=getattr(subprocess, "DETACHED_PROCESS", 0),
+            )
+
+        deadline = time.monotonic() + startup_timeout
+        while not _listening(port):
+            if process.poll() is not None or time.monotonic() > deadline:
+                kill_process(process.pid)
+                raise RuntimeError(f"Browser server did not start on port {port}; see {log_file}")
+            time.sleep(0.1)
+
+        endpoint = f"ws://127.0.0.1:{port}/"
+        state_file.write_text(json.dumps({
+            "endpoint": endpoint,
+            "pid": process.pid,
+            "started": process_start_time(process.pid),
+            "port": port,
+            "version": playwright_version(),
+            "headless": headless,
+        }), encoding="utf-8")
+        return endpoint
+
+
+def connect_options(endpoint: str, launch_args: dict) -> dict:
+    """
+    Keyword arguments for BrowserType.connect() that keep pytest-playwright's launch options.
+
+    The server receives them as JSON, so keys are converted to camelCase and
+    client-side options (slow_mo) are passed to connect() directly.
+    """
+    launch_args = dict(launch_args)
+    options = {"ws_endpoint": endpoint}
+    if "slow_mo" in launch_args:
+        options["slow_mo"] = launch_args.pop("slow_mo")
+    server_args = {
+        "".join(word.capitalize() if i else word for i, word in enumerate(key.split("_"))): value
+        for key, value in launch_args.items()
+        if isinstance(value, (str, int, float, bool, list, dict))
+    }
+    # The server's headless setting wins in extension mode
+    server_args.pop("headless", None)
+    options["headers"] = {LAUNCH_OPTIONS_HEADER: json.dumps(server_args)}
+    return options
+
+
+def stop_browser_server(state_file: Path = STATE_FILE) -> bool:
+    """Stop the recorded browser server; returns False if none was running."""
+    state = _read_state(state_file)
+    state_file.unlink(missing_ok=True)
+    if not _is_running(state):
+        return False
+    kill_process(state["pid"])
+    return True
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    command = args[0] if args else "status"
+    if command == "stop":
+        print("Stopped" if stop_browser_server() else "No browser server running")
+        return 0
+    if command == "status":
+        state = _read_state(STATE_FILE)
+        running = _is_running(state) and _listening(state["port"])
+        print(json.dumps(state, indent=2) if running else "No browser server running")
+        return 0
+    print("Usage: python -m tests.utils.browser_server [status|stop]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
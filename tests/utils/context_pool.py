@@ -0,0 +1,216 @@
+"""
+Browser Context Pool
+
+Keeps browser contexts (each with one open page) ready for reuse, so tests do
+not pay for new_context() + new_page() on their critical path. Released
+contexts are reset to their initial storage state and parked on about:blank;
+contexts that fail to reset or reach max_uses are discarded and replaced.
+
+Reset covers cookies, permissions, routes and, for the origin the page was
+on, web storage, IndexedDB, Cache Storage and service workers. Whatever it
+cannot undo makes the context unusable for the next test, so such contexts
+are discarded as well:
+
+- init scripts, bindings, event listeners, clock changes, and overrides of
+  timeouts, viewport, media, offline mode, geolocation or extra headers
+  (the pool watches the context's and page's methods for these calls)
+
+The suite's readiness strategies arm each page once and expect that state to
+stay, so they call through untracked() and do not taint the context.
+- storage of any other origin, i.e. the test navigated a frame to a second
+  origin, or ended somewhere other than the origin it visited
+- popups and other extra pages
+
+The sync Playwright API is not thread-safe, so refilling happens when a test
+releases its context (fixture teardown) rather than on a background thread.
+"""
+import functools
+import json
+from collections import deque
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Browser, BrowserContext, Error as PlaywrightError, Page
+
+# Clear all storage of the current origin and restore the seeded localStorage.
+# Each store is optional: opaque origins have none, and browsers differ in
+# what they expose.
+_RESET_STORAGE = """
+async (items) => {
+  try {
+    localStorage.clear();
+    sessionStorage.clear();
+    for (const {name, value} of items) localStorage.setItem(name, value);
+  } catch (e) {}
+  try {
+    const databases = await indexedDB.databases();
+    await Promise.all(databases.map(({name}) => new Promise((resolve) => {
+      const request = indexedDB.deleteDatabase(name);
+      request.onsuccess = request.onerror = request.onblocked = resolve;
+    })));
+  } catch (e) {}
+  try {
+    for (const key of await caches.keys()) await caches.delete(key);
+  } catch (e) {}
+  try {
+    for (const registration of await navigator.serviceWorker.getRegistrations()) {
+      await registration.unregister();
+    }
+  } catch (e) {}
+}
+"""
+
+# Calls whose effect outlives the test and that reset cannot undo
+_CONTEXT_MUTATORS = (
+    "add_init_script", "expose_binding", "expose_function", "on", "once",
+    "set_default_navigation_timeout", "set_default_timeout", "set_extra_http_headers",
+    "set_geolocation", "set_offline",
+)
+_PAGE_MUTATORS = (
+    "add_init_script", "add_locator_handler", "emulate_media", "expose_binding",
+    "expose_function", "on", "once", "set_default_navigation_timeout", "set_default_timeout",
+    "set_extra_http_headers", "set_viewport_size",
+)
+_CLOCK_MUTATORS = (
+    "fast_forward", "install", "pause_at", "resume", "run_for", "set_fixed_time", "set_system_time",
+)
+
+
+def untracked(method):
+    """The method without the pool's tracking, for calls whose effect may carry over to the next test."""
+    return getattr(method, "untracked", method)
+
+
+def _origin(url: str) -> Optional[str]:
+    """Origin of an http(s) URL; None for about:, data: and the like."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") else None
+
+
+class PooledContext:
+    """A pooled context, its page and how often it has been handed out."""
+
+    __slots__ = ("context", "page", "uses", "tainted", "origins")
+
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        # Set once the current test changes state that reset cannot undo
+        self.tainted = False
+        # http(s) origins the page's frames visited during the current test
+        self.origins: set = set()
+        page.on("framenavigated", lambda frame: self.origins.add(_origin(frame.url)))
+        # Registered after our own listener, so only the test's calls count
+        self._watch(context, _CONTEXT_MUTATORS)
+        self._watch(page, _PAGE_MUTATORS)
+        self._watch(context.clock, _CLOCK_MUTATORS)
+
+    def _watch(self, target, names: tuple) -> None:
+        """Replace the named methods on this one object with versions that taint the context."""
+        for name in names:
+            method = getattr(target, name, None)
+            if method is not None:
+                setattr(target, name, self._tainting(method))
+
+    def _tainting(self, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            self.tainted = True
+            return method(*args, **kwargs)
+        wrapper.untracked = method
+        return wrapper
+
+
+class ContextPool:
+    """Pool of ready-to-use browser contexts created with the same arguments."""
+
+    def __init__(self, browser: Browser, size: int, context_args: Optional[dict] = None,
+                 max_uses: int = 50):
+        """
+        Args:
+            browser: Browser to create contexts in
+            size: Number of idle contexts to keep ready
+            context_args: Arguments for browser.new_context (as browser_context_args)
+            max_uses: Tests a context may serve before it is replaced
+        """
+        self.browser = browser
+        self.size = size
+        self.context_args = dict(context_args or {})
+        self.max_uses = max_uses
+        self._idle: deque = deque()
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+        # The storage state contexts start with, restored on every reset
+        state = self.context_args.get("storage_state")
+        if isinstance(state, (str, Path)):
+            state = json.loads(Path(state).read_text(encoding="utf-8"))
+        self.initial_state: dict = state or {}
+
+    def _create(self) -> PooledContext:
+        context = self.browser.new_context(**self.context_args)
+        self.stats["created"] += 1
+        return PooledContext(context, context.new_page())
+
+    def fill(self) -> None:
+        """Create contexts until size are idle."""
+        while len(self._idle) < self.size:
+            self._idle.append(self._create())
+
+    def acquire(self) -> PooledContext:
+        """Take an idle context, creating one if the pool is empty."""
+        pooled = self._idle.popleft() if self._idle else self._create()
+        if pooled.uses:
+            self.stats["reused"] += 1
+        pooled.uses += 1
+        return pooled
+
+    def release(self, pooled: PooledContext) -> None:
+        """Reset a context and return it to the pool, or discard it."""
+        if pooled.uses >= self.max_uses or len(self._idle) >= self.size or not self._reset(pooled):
+            self._discard(pooled)
+            return
+        self._idle.append(pooled)
+
+    def _reset(self, pooled: PooledContext) -> bool:
+        """Restore a context to its initial state; False if it cannot be reused."""
+        try:
+            state = self.initial_state
+            context, page = pooled.context, pooled.page
+            if pooled.tainted or page.is_closed() or len(context.pages) > 1:
+                return False
+            # Storage can only be cleared from a page on the same origin
+            visited = pooled.origins - {None}
+            origin = _origin(page.url)
+            if visited - {origin}:
+                return False
+            context.unroute_all(behavior="ignoreErrors")
+            page.unroute_all(behavior="ignoreErrors")
+
+            if origin:
+                items = next((entry.get("localStorage", []) for entry in state.get("origins", [])
+                              if entry.get("origin") == origin), [])
+                page.evaluate(_RESET_STORAGE, items)
+
+            context.clear_cookies()
+            context.clear_permissions()
+            if state.get("cookies"):
+                context.add_cookies(state["cookies"])
+            page.goto("about:blank")
+            pooled.origins.clear()
+            return True
+        except PlaywrightError:
+            return False
+
+    def _discard(self, pooled: PooledContext) -> None:
+        self.stats["discarded"] += 1
+        try:
+            pooled.context.close()
+        except PlaywrightError:
+            pass
+
+    def close(self) -> None:
+        """Close every idle context."""
+        while self._idle:
+            self._idle.popleft().context.close()
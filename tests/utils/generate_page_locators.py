@@ -0,0 +1,183 @@
+"""
+Page Locator Generator
+
+Turns each synced locator YAML (generated by sync-locators.ts) into a Python
+module under tests/pages/generated/ with one typed property per locator key.
+Page objects that use a generated class skip YAML parsing and the per-call
+lookup in BasePage.get_locator.
+
+Only modules whose source YAML changed are rewritten; modules whose YAML was
+deleted are removed.
+
+Usage:
+    python -m tests.utils.generate_page_locators
+"""
+import hashlib
+import json
+import keyword
+import re
+from pathlib import Path
+
+from tests.utils.locator_loader import LocatorLoader
+
+GENERATED_DIR = Path(__file__).parent.parent / "pages" / "generated"
+GENERATOR_VERSION = "2"
+SOURCE_MARKER = "# source-sha256: "
+
+
+def module_name(yaml_path: Path) -> str:
+    """Return the module name for a locator file (chat/panel.yaml -> chat_panel_locators)."""
+    relative = yaml_path.relative_to(LocatorLoader.LOCATORS_DIR.resolve()).with_suffix("")
+    return _identifier("_".join(relative.parts)).lower() + "_locators"
+
+
+def class_name(module: str) -> str:
+    """Return the class name for a generated module (chat_locators -> ChatLocators)."""
+    return "".join(part.capitalize() for part in module.split("_") if part)
+
+
+def _identifier(name: str) -> str:
+    """Make an arbitrary string a valid, non-keyword Python identifier."""
+    name = re.sub(r"\W", "_", str(name))
+    if not name or name[0].isdigit():
+        name = f"_{name}"
+    if keyword.iskeyword(name):
+        name = f"{name}_"
+    return name
+
+
+def attribute_names(locators: dict) -> dict:
+    """
+    Map each locator key to its property and constant names.
+
+    Raises:
+        ValueError: If two keys normalize to the same property or constant name
+    """
+    names = {}
+    owners: dict = {}
+    for key in locators:
+        attr = _identifier(key)
+        if attr == "page":
+            attr = "page_"
+        elif attr.startswith("__"):
+            # Would clash with or be mangled like class internals
+            attr = f"key{attr}"
+        constant = attr.upper()
+        for name in (attr, constant):
+            owners.setdefault(name, []).append(key)
+        names[key] = (attr, constant)
+
+    collisions = {name: keys for name, keys in owners.items() if len(set(keys)) > 1}
+    if collisions:
+        details = "; ".join(f"{', '.join(map(repr, keys))} -> {name}" for name, keys in collisions.items())
+        raise ValueError(f"Locator keys collide after normalization: {details}")
+    return names
+
+
+def render(yaml_path: Path, locators: dict, digest: str) -> str:
+    """Render the source of one generated module."""
+    module = module_name(yaml_path)
+    cls = class_name(module)
+    relative = yaml_path.relative_to(LocatorLoader.LOCATORS_DIR.resolve().parent.parent)
+
+    try:
+        names = attribute_names(locators)
+    except ValueError as e:
+        raise ValueError(f"{relative.as_posix()}: {e}") from e
+    entries = [(*names[key], str(testid)) for key, testid in locators.items() if testid is not None]
+
+    lines = [
+        '"""',
+        f"Generated by tests/utils/generate_page_locators.py from {relative.as_posix()}.",
+        "Do not edit by hand; rerun the generator after syncing locators.",
+        '"""',
+        f"{SOURCE_MARKER}{digest}",
+        "from playwright.sync_api import Locator, Page",
+        "",
+    ]
+    lines += [f"{constant} = {json.dumps(testid)}" for _, constant, testid in entries]
+    lines += [
+        "",
+        "",
+        f"class {cls}:",
+        f'    """Typed accessors for the locators in {yaml_path.name}."""',
+        "",
+        '    __slots__ = ("page",)',
+        "",
+        "    def __init__(self, page: Page):",
+        "        self.page = page",
+    ]
+    for attr, constant, _ in entries:
+        lines += [
+            "",
+            "    @property",
+            f"    def {attr}(self) -> Locator:",
+            f"        return self.page.get_by_test_id({constant})",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def _existing_digest(path: Path) -> str:
+    """Return the source digest recorded in a generated module, if any."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(SOURCE_MARKER):
+                    return line[len(SOURCE_MARKER):].strip()
+    except OSError:
+        pass
+    return ""
+
+
+def generate(output_dir: Path = GENERATED_DIR) -> dict:
+    """
+    Regenerate page locator modules for every synced locator file.
+
+    Returns:
+        Dictionary with "written", "unchanged" and "removed" module paths
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    init = output_dir / "__init__.py"
+    if not init.exists():
+        init.write_text('"""Generated page locator modules."""\n', encoding="utf-8")
+
+    result = {"written": [], "unchanged": [], "removed": []}
+    expected = set()
+    for yaml_file in LocatorLoader.discover():
+        yaml_path = Path(yaml_file)
+        data = LocatorLoader.load(yaml_file)
+        if not isinstance(data, dict) or "locators" not in data:
+            continue
+
+        target = output_dir / f"{module_name(yaml_path)}.py"
+        expected.add(target)
+        digest = hashlib.sha256(GENERATOR_VERSION.encode() + yaml_path.read_bytes()).hexdigest()
+        if _existing_digest(target) == digest:
+            result["unchanged"].append(target)
+            continue
+
+        source = render(yaml_path, LocatorLoader.get_all_synced_locators(yaml_file), digest)
+        target.write_text(source, encoding="utf-8")
+        result["written"].append(target)
+
+    for stale in output_dir.glob("*_locators.py"):
+        if stale not in expected and _existing_digest(stale):
+            stale.unlink()
+            result["removed"].append(stale)
+    return result
+
+
+def main() -> None:
+    try:
+        result = generate()
+    except ValueError as e:
+        raise SystemExit(f"error: {e}") from e
+    for status in ("written", "unchanged", "removed"):
+        for path in result[status]:
+            print(f"{status:>9}: {path.name}")
+    print(f"{len(result['written'])} written, {len(result['unchanged'])} unchanged, "
+          f"{len(result['removed'])} removed")
+
+
+if __name__ == "__main__":
+    main()
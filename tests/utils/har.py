@@ -0,0 +1,68 @@
+"""
+HAR Record / Replay
+
+Records the network traffic of each scenario against a live backend into a
+HAR file, and later serves it back with route_from_har so runs need no
+backend at all. HARs are stored per feature module and scenario:
+tests/hars/<test module>/<test name>.har
+
+Replay misses (requests not in the HAR) are handled per --har-not-found:
+    abort     abort the request
+    fallback  let it through to the network (e.g. the local Vite dev server)
+    fail      abort it and fail the test, listing every miss
+"""
+import re
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from playwright.sync_api import BrowserContext, Route
+
+HAR_DIR = Path(__file__).parent.parent / "hars"
+NOT_FOUND_MODES = ("abort", "fallback", "fail")
+
+
+def har_path(node: pytest.Item, har_dir: Path = HAR_DIR) -> Path:
+    """Return the HAR file for a test item."""
+    name = re.sub(r"[^\w.-]", "_", node.name)
+    return har_dir / node.path.stem / f"{name}.har"
+
+
+class HarSession:
+    """Routes one context through a HAR file in record or replay mode."""
+
+    def __init__(self, path: Path, mode: str, not_found: str = "abort", url: Optional[str] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown HAR mode '{mode}'")
+        if not_found not in NOT_FOUND_MODES:
+            raise ValueError(f"Unknown HAR not-found mode '{not_found}'")
+        self.path = path
+        self.mode = mode
+        self.not_found = not_found
+        self.url = url
+        self.misses: list = []
+
+    def install(self, context: BrowserContext) -> "HarSession":
+        """
+        Attach the HAR to a context.
+
+        In record mode the HAR is written when the context closes.
+        """
+        if self.mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            context.route_from_har(self.path, url=self.url, update=True,
+                                   update_content="embed", update_mode="minimal")
+            return self
+
+        if not self.path.exists():
+            raise FileNotFoundError(f"No recorded HAR for this test: {self.path}")
+        if self.not_found == "fail":
+            # Registered first so it only sees requests the HAR route falls back on
+            context.route(self.url or "**/*", self._record_miss)
+        not_found = "abort" if self.not_found == "abort" else "fallback"
+        context.route_from_har(self.path, url=self.url, not_found=not_found)
+        return self
+
+    def _record_miss(self, route: Route) -> None:
+        self.misses.append(f"{route.request.method} {route.request.url}")
+        route.abort()
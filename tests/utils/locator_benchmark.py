@@ -0,0 +1,90 @@
+"""
+Locator Parse Benchmark
+
+Generates synthetic synced locator files (the format written by
+sync-locators.ts) and reports parse time and peak memory for the libyaml
+CSafeLoader and the pure-Python SafeLoader.
+
+Usage:
+    python -m tests.utils.locator_benchmark
+    python -m tests.utils.locator_benchmark --sizes 1000 10000 --repeat 5
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import yaml
+
+
+def available_loaders() -> dict:
+    """Return the loaders that can be benchmarked in this environment."""
+    loaders = {"SafeLoader": yaml.SafeLoader}
+    if hasattr(yaml, "CSafeLoader"):
+        loaders["CSafeLoader"] = yaml.CSafeLoader
+    return loaders
+
+
+def generate_synced_yaml(path: Path, entries: int) -> Path:
+    """Write a synced locator file with the given number of entries."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("source: src/screensets/benchmark/screens/BenchmarkScreen.tsx\n")
+        f.write("generated_by: sync-locators.ts\n")
+        f.write("locators:\n")
+        for i in range(entries):
+            f.write(f"  aqa_element_{i:06d}:\n")
+            f.write(f"    testid: benchmark-element-{i:06d}\n")
+            f.write("    component: Button\n")
+            f.write(f"    line: {i + 1}\n")
+    return path
+
+
+def measure(path: Path, loader, repeat: int) -> dict:
+    """Return the best parse time and the peak traced memory for one loader."""
+    text = path.read_text(encoding="utf-8")
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        yaml.load(text, Loader=loader)
+        best = min(best, time.perf_counter() - start)
+
+    # Measured separately so tracing overhead does not skew the timings.
+    # tracemalloc only sees Python allocations, not libyaml's own buffers.
+    tracemalloc.start()
+    yaml.load(text, Loader=loader)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Number of locator entries per generated file")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per size and loader (best is reported)")
+    args = parser.parse_args()
+
+    loaders = available_loaders()
+    if "CSafeLoader" not in loaders:
+        print("PyYAML was built without libyaml; only SafeLoader is measured.")
+
+    print(f"{'entries':>9} {'loader':<12} {'parse (ms)':>11} {'peak (MiB)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = generate_synced_yaml(Path(tmp) / f"synced_{size}.yaml", size)
+            results = {name: measure(path, loader, args.repeat)
+                       for name, loader in loaders.items()}
+            for name, result in results.items():
+                print(f"{size:>9} {name:<12} {result['seconds'] * 1000:>11.1f} "
+                      f"{result['peak_bytes'] / 2**20:>11.1f}")
+            if len(results) == 2:
+                speedup = results["SafeLoader"]["seconds"] / results["CSafeLoader"]["seconds"]
+                print(f"{'':>9} {'speedup':<12} {speedup:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
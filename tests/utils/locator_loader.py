@@ -2,17 +2,204 @@
 Locator Loader Utility
 
 Loads locators from YAML files and provides them to Page Objects.
+
+Parsed files are also kept in an on-disk cache under tests/.pytest_cache so
+that new processes (xdist workers, watch-mode reruns) skip the YAML parse
+when the file has not changed. Set LOCATOR_DISK_CACHE=0 to disable it.
 """
+import hashlib
+import os
+import pickle
+import threading
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from tests.utils.locator_store import LocatorStore, compile_store
 from pathlib import Path
 from typing import Optional
 
+try:
+    # libyaml-backed loader, available when PyYAML was built against libyaml
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+DISK_CACHE_DIR = Path(__file__).parent.parent / ".pytest_cache" / "locators"
+DISK_CACHE_ENABLED = os.getenv("LOCATOR_DISK_CACHE", "1") != "0"
+
+
+def _parse_yaml(stream):
+    """Parse a whole YAML document with the fastest available safe loader."""
+    return yaml.load(stream, Loader=YamlLoader)
+
+
+class _FullParseRequired(Exception):
+    """The locators section uses YAML features the event parser does not model."""
+
+
+def parse_synced_locators(stream) -> dict:
+    """
+    Build only the locator_key -> testid map of a synced locator file.
+
+    Walks PyYAML parse events and skips every top-level section other than
+    ``locators`` without constructing it, so large metadata blocks cost only
+    scanning time. The result matches synced_from_document() on a full parse;
+    aliases, merge keys, non-string scalars and duplicate keys fall back to a
+    full parse.
+
+    Args:
+        stream: YAML text or text file object
+
+    Returns:
+        Dictionary of locator_key -> testid
+
+    Raises:
+        ValueError: If the document is empty or not a mapping at the top level
+    """
+    if not isinstance(stream, str):
+        stream = stream.read()
+    try:
+        return _walk_synced_events(yaml.parse(stream, Loader=YamlLoader))
+    except _FullParseRequired:
+        return synced_from_document(_parse_yaml(stream))
+
+
+def synced_from_document(data: dict) -> dict:
+    """Derive the locator_key -> testid map from a fully parsed synced file."""
+    locators = data.get('locators') or {}
+    return {name: entry.get('testid') for name, entry in locators.items() if entry}
+
+
+_resolver = yaml.resolver.Resolver()
+
+
+def _scalar(event) -> Optional[str]:
+    """Resolve a scalar event to a str or None, or demand a full parse."""
+    tag = event.tag
+    if tag is None or tag == "!":
+        tag = _resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+    if tag == "tag:yaml.org,2002:null":
+        return None
+    if tag == "tag:yaml.org,2002:str":
+        return event.value
+    raise _FullParseRequired
+
+
+def _skip(events, event) -> None:
+    """Consume the rest of the node that starts with event."""
+    if isinstance(event, yaml.AliasEvent):
+        return
+    depth = 1 if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)) else 0
+    while depth:
+        event = next(events)
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+
+
+def _walk_synced_events(events) -> dict:
+    """Extract the locators section from a stream of parse events."""
+    events = iter(events)
+    next(events)  # StreamStartEvent
+    event = next(events)
+    if isinstance(event, yaml.StreamEndEvent):
+        raise ValueError("expected a mapping at the top level, got an empty document")
+    root = next(events)
+    if not isinstance(root, yaml.MappingStartEvent):
+        raise ValueError("expected a mapping at the top level")
+
+    synced, seen_locators = {}, False
+    while True:
+        event = next(events)
+        if isinstance(event, yaml.MappingEndEvent):
+            break
+        if not isinstance(event, yaml.ScalarEvent):
+            raise _FullParseRequired
+        key = _scalar(event)
+        value = next(events)
+        if key != "locators":
+            _skip(events, value)
+            continue
+        if seen_locators:
+            # A full parse keeps only the last duplicate
+            raise _FullParseRequired
+        seen_locators = True
+        if isinstance(value, yaml.ScalarEvent) and _scalar(value) is None:
+            continue
+        if not isinstance(value, yaml.MappingStartEvent):
+            raise _FullParseRequired
+        synced = _walk_locator_entries(events)
+
+    next(events)  # DocumentEndEvent
+    if not isinstance(next(events), yaml.StreamEndEvent):
+        raise ValueError("expected a single document in the stream")
+    return synced
+
+
+def _walk_locator_entries(events) -> dict:
+    """Read ``key: {testid: ...}`` pairs up to the end of the locators mapping."""
+    synced, seen = {}, set()
+    while True:
+        event = next(events)
+        if isinstance(event, yaml.MappingEndEvent):
+            return synced
+        if not isinstance(event, yaml.ScalarEvent):
+            raise _FullParseRequired
+        name = _scalar(event)
+        if name in seen:
+            raise _FullParseRequired
+        seen.add(name)
+        entry = next(events)
+        if isinstance(entry, yaml.ScalarEvent) and _scalar(entry) is None:
+            continue
+        if not isinstance(entry, yaml.MappingStartEvent):
+            raise _FullParseRequired
+
+        testid, empty = None, True
+        while True:
+            event = next(events)
+            if isinstance(event, yaml.MappingEndEvent):
+                break
+            empty = False
+            if not isinstance(event, yaml.ScalarEvent):
+                raise _FullParseRequired
+            field = _scalar(event)
+            value = next(events)
+            if field == "testid":
+                if not isinstance(value, yaml.ScalarEvent):
+                    raise _FullParseRequired
+                testid = _scalar(value)
+            else:
+                _skip(events, value)
+        if not empty:
+            synced[name] = testid
+
 
 class LocatorLoader:
     """Loads and provides access to locators from YAML files."""
 
+    # Fields that get_locator() can resolve through the per-file index
+    INDEXED_FIELDS = ("aria_label", "placeholder", "title", "text")
+
+    LOCATORS_DIR = Path(__file__).parent.parent / "locators"
+
+    # All caches are keyed by the resolved path string, so relative and
+    # absolute spellings of the same file share one entry.
     _cache: dict = {}
     _synced_cache: dict = {}  # Cache for new synced format
+    _index: dict = {}  # resolved path -> {(category, field, value): element}
+    _keys: dict = {}  # yaml_path as given -> resolved path
+
+    # _lock guards _path_locks; each file gets its own lock so different
+    # files can be parsed concurrently while one file is parsed only once.
+    _lock = threading.Lock()
+    _path_locks: dict = {}
+
+    # Memory-mapped compiled store (see use_store); serves synced lookups
+    _store: Optional[LocatorStore] = None
+
+    # Name of the PyYAML loader used for parsing ("CSafeLoader" or "SafeLoader")
+    yaml_loader: str = YamlLoader.__name__
 
     @classmethod
     def load(cls, yaml_path: str) -> dict:
@@ -25,26 +212,161 @@ class LocatorLoader:
         Returns:
             Dictionary containing all locators from the file
         """
+        key = cls._key(yaml_path)
         # Check cache first
-        if yaml_path in cls._cache:
-            return cls._cache[yaml_path]
+        if key in cls._cache:
+            return cls._cache[key]
+
+        with cls._path_lock(key):
+            if key in cls._cache:
+                return cls._cache[key]
+
+            path = Path(key)
+            if not path.exists():
+                raise FileNotFoundError(f"Locator file not found: {path}")
+
+            data = cls._load_file(path)
+
+            # Publish the index before the data so readers never miss it
+            cls._index[key] = cls._build_index(data)
+            cls._cache[key] = data
+        return data
+
+    @classmethod
+    def resolve_path(cls, yaml_path: str) -> Path:
+        """
+        Resolve a locator file path.
+
+        Args:
+            yaml_path: Path to the YAML file (relative to tests/locators or absolute)
 
-        # Resolve path
+        Returns:
+            The absolute, symlink-free path of the file
+        """
         path = Path(yaml_path)
         if not path.is_absolute():
             # Try relative to tests/locators
-            base_path = Path(__file__).parent.parent / "locators"
-            path = base_path / yaml_path
+            path = cls.LOCATORS_DIR / yaml_path
+        return path.resolve()
 
-        if not path.exists():
-            raise FileNotFoundError(f"Locator file not found: {path}")
+    @classmethod
+    def _key(cls, yaml_path: str) -> str:
+        """Return the cache key for a path, memoizing the resolution."""
+        key = cls._keys.get(yaml_path)
+        if key is None:
+            key = str(cls.resolve_path(yaml_path))
+            cls._keys[yaml_path] = key
+        return key
 
-        with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+    @classmethod
+    def _path_lock(cls, key: str) -> threading.RLock:
+        """Return the lock that serializes population of one file's caches."""
+        with cls._lock:
+            lock = cls._path_locks.get(key)
+            if lock is None:
+                lock = cls._path_locks[key] = threading.RLock()
+            return lock
+
+    @classmethod
+    def _load_file(cls, path: Path, synced_only: bool = False):
+        """
+        Parse a YAML file, going through the on-disk cache when enabled.
+
+        A cache entry is reused as-is when mtime and size still match. When
+        they differ the content hash decides, so a touched but unchanged file
+        is not parsed again.
+
+        With synced_only, only the locators section is built (see
+        parse_synced_locators) and it is cached separately from full parses.
+        """
+        parse = parse_synced_locators if synced_only else _parse_yaml
+        if not DISK_CACHE_ENABLED:
+            with open(path, "r", encoding="utf-8") as f:
+                return parse(f)
+
+        resolved = path.resolve()
+        stat = resolved.stat()
+        entry = cls._read_disk_cache(resolved, synced_only)
+        if (entry and entry["mtime_ns"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size):
+            return entry["data"]
 
-        cls._cache[yaml_path] = data
+        raw = resolved.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry["sha256"] == digest:
+            data = entry["data"]
+        else:
+            data = parse(raw.decode("utf-8"))
+
+        cls._write_disk_cache(resolved, {
+            "path": str(resolved),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "data": data,
+        }, synced_only)
         return data
 
+    @staticmethod
+    def _disk_cache_file(resolved: Path, synced_only: bool = False) -> Path:
+        """Return the cache file used for a resolved locator path."""
+        name = hashlib.sha1(str(resolved).encode("utf-8")).hexdigest()
+        suffix = ".synced.pickle" if synced_only else ".pickle"
+        return DISK_CACHE_DIR / f"{name}{suffix}"
+
+    @classmethod
+    def _read_disk_cache(cls, resolved: Path, synced_only: bool = False) -> Optional[dict]:
+        """Read a cache entry, treating unreadable or foreign entries as missing."""
+        try:
+            with open(cls._disk_cache_file(resolved, synced_only), "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+        if not isinstance(entry, dict) or entry.get("path") != str(resolved):
+            return None
+        return entry
+
+    @classmethod
+    def _write_disk_cache(cls, resolved: Path, entry: dict, synced_only: bool = False) -> None:
+        """Write a cache entry atomically; failures only cost the next parse."""
+        target = cls._disk_cache_file(resolved, synced_only)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, target)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    @classmethod
+    def _build_index(cls, data) -> dict:
+        """
+        Build a (category, field, value) -> element index for a loaded file.
+
+        The first element wins on duplicate values, matching the order a
+        linear scan over the category would return.
+        """
+        index = {}
+        if not isinstance(data, dict):
+            return index
+        for category, elements in data.items():
+            if not isinstance(elements, list):
+                continue
+            for elem in elements:
+                if not isinstance(elem, dict):
+                    continue
+                for field in cls.INDEXED_FIELDS:
+                    value = elem.get(field)
+                    if value is None:
+                        continue
+                    try:
+                        index.setdefault((category, field, value), elem)
+                    except TypeError:
+                        # Unhashable value (list/dict) - only reachable by a scan
+                        continue
+        return index
+
     @classmethod
     def get_locator(cls, yaml_path: str, category: str, identifier: str,
                     identifier_field: str = "aria_label") -> Optional[str]:
@@ -61,8 +383,11 @@ class LocatorLoader:
             The recommended locator string or None if not found
         """
         data = cls.load(yaml_path)
-        elements = data.get(category, [])
+        if identifier_field in cls.INDEXED_FIELDS:
+            elem = cls._index[cls._key(yaml_path)].get((category, identifier_field, identifier))
+            return elem.get("recommended") if elem else None
 
+        elements = data.get(category, [])
         for elem in elements:
             if elem.get(identifier_field) == identifier:
                 return elem.get("recommended")
@@ -84,11 +409,155 @@ class LocatorLoader:
         data = cls.load(yaml_path)
         return data.get(category, [])
 
+    @classmethod
+    def discover(cls) -> list:
+        """
+        Find every locator file under tests/locators.
+
+        Returns:
+            Sorted list of absolute YAML paths
+        """
+        if not cls.LOCATORS_DIR.is_dir():
+            return []
+        files = [*cls.LOCATORS_DIR.rglob("*.yaml"), *cls.LOCATORS_DIR.rglob("*.yml")]
+        return sorted(str(path.resolve()) for path in files)
+
+    @classmethod
+    def preload(cls, yaml_paths: Optional[list] = None,
+                max_workers: Optional[int] = None) -> list:
+        """
+        Parse locator files concurrently and warm the synced-locator cache.
+
+        Args:
+            yaml_paths: Files to load (defaults to everything under tests/locators)
+            max_workers: Thread pool size (defaults to the executor's default)
+
+        Returns:
+            List of the paths that were loaded
+
+        Raises:
+            ValueError: If any file cannot be read or parsed, listing all failures
+        """
+        paths = cls.discover() if yaml_paths is None else list(yaml_paths)
+
+        def warm(yaml_path):
+            # The streaming parse still reads every event, so syntax errors
+            # anywhere in the file surface here
+            cls.get_all_synced_locators(yaml_path)
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {path: executor.submit(warm, path) for path in paths}
+            for path, future in futures.items():
+                error = future.exception()
+                if error is not None:
+                    errors.append(f"{path}: {error}")
+
+        if errors:
+            raise ValueError("Failed to load locator files:\n" + "\n".join(errors))
+        return paths
+
+    @classmethod
+    def reload(cls, yaml_path: str) -> None:
+        """
+        Re-parse a locator file that changed on disk.
+
+        Only the caches that already hold the file are refreshed. The memoized
+        synced map is updated in place, so page objects that were already
+        constructed (BasePage._locators) see the new testids.
+
+        Args:
+            yaml_path: Path to the YAML file
+        """
+        key = cls._key(yaml_path)
+        with cls._path_lock(key):
+            path = Path(key)
+            if not path.exists():
+                raise FileNotFoundError(f"Locator file not found: {path}")
+
+            if key in cls._cache:
+                data = cls._load_file(path)
+                cls._index[key] = cls._build_index(data)
+                cls._cache[key] = data
+
+            synced = cls._synced_cache.get(key)
+            if synced is None:
+                return
+            fresh = cls._load_file(path, synced_only=True)
+            if not isinstance(synced, dict):
+                # Read-only store view: later lookups get the fresh dict
+                cls._synced_cache[key] = fresh
+                return
+            synced.update(fresh)
+            for name in [name for name in synced if name not in fresh]:
+                del synced[name]
+
+    @classmethod
+    def invalidate(cls, yaml_path: str) -> None:
+        """
+        Drop a file from the caches so the next access parses it again.
+
+        Args:
+            yaml_path: Path to the YAML file
+        """
+        key = cls._key(yaml_path)
+        with cls._path_lock(key):
+            cls._cache.pop(key, None)
+            cls._index.pop(key, None)
+            cls._synced_cache.pop(key, None)
+
+    @classmethod
+    def compile_store(cls, out_path, yaml_paths: Optional[list] = None) -> Path:
+        """
+        Compile the synced locators of many files into one binary store.
+
+        Args:
+            out_path: Destination of the store file
+            yaml_paths: Files to compile (defaults to everything under tests/locators)
+
+        Returns:
+            The path of the written store
+
+        Raises:
+            ValueError: If any file cannot be read or parsed
+        """
+        paths = cls.preload(yaml_paths)
+        synced = {}
+        for path in paths:
+            locators = dict(cls.get_all_synced_locators(path))
+            # The store holds strings only; other files keep being served from YAML
+            if all(isinstance(k, str) and (v is None or isinstance(v, str)) for k, v in locators.items()):
+                synced[cls._key(path)] = locators
+        return compile_store(synced, out_path)
+
+    @classmethod
+    def use_store(cls, store_path) -> LocatorStore:
+        """
+        Serve synced locators from a memory-mapped compiled store.
+
+        Files in the store are no longer parsed for get_all_synced_locators and
+        get_synced_locator; other files and load() keep using YAML.
+
+        Args:
+            store_path: Path written by compile_store()
+
+        Returns:
+            The opened LocatorStore
+        """
+        store = LocatorStore(store_path)
+        with cls._lock:
+            cls._store = store
+            cls._synced_cache.clear()
+        return store
+
     @classmethod
     def clear_cache(cls):
         """Clear the locator cache."""
-        cls._cache.clear()
-        cls._synced_cache.clear()
+        with cls._lock:
+            cls._cache.clear()
+            cls._synced_cache.clear()
+            cls._index.clear()
+            cls._keys.clear()
 
     @classmethod
     def get_synced_locator(cls, yaml_path: str, locator_key: str) -> Optional[str]:
@@ -102,6 +571,9 @@ class LocatorLoader:
         Returns:
             The testid string or None if not found
         """
+        if cls._store is not None and cls._key(yaml_path) in cls._store:
+            return cls.get_all_synced_locators(yaml_path).get(locator_key)
+
         data = cls.load(yaml_path)
         locators = data.get('locators', {})
         entry = locators.get(locator_key)
@@ -118,8 +590,27 @@ class LocatorLoader:
             yaml_path: Path to the YAML file
 
         Returns:
-            Dictionary of locator_key -> testid
+            Dictionary of locator_key -> testid. The dictionary is memoized and
+            shared between callers, so treat it as read-only.
         """
-        data = cls.load(yaml_path)
-        locators = data.get('locators', {})
-        return {key: entry.get('testid') for key, entry in locators.items() if entry}
\ No newline at end of file
+        key = cls._key(yaml_path)
+        if key in cls._synced_cache:
+            return cls._synced_cache[key]
+
+        with cls._path_lock(key):
+            if key in cls._synced_cache:
+                return cls._synced_cache[key]
+            if cls._store is not None and key in cls._store:
+                synced = cls._store.get_locators(key)
+                cls._synced_cache[key] = synced
+                return synced
+            if key in cls._cache:
+                synced = synced_from_document(cls._cache[key])
+            else:
+                # Stream only the locators section instead of the whole document
+                path = Path(key)
+                if not path.exists():
+                    raise FileNotFoundError(f"Locator file not found: {path}")
+                synced = cls._load_file(path, synced_only=True)
+            cls._synced_cache[key] = synced
+        return synced
\ No newline at end of file
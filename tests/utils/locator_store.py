@@ -0,0 +1,207 @@
+"""
+Compiled Locator Store
+
+Compiles the synced locators of many YAML files into one read-only binary file
+that xdist workers memory-map instead of each holding parsed copies. Lookups
+go through an embedded open-addressing hash table, so no per-file dicts are
+materialized; StoreLocators exposes the Mapping interface page objects use.
+
+File layout (little-endian):
+    header   MAGIC, n_files, n_entries, n_slots, files_off, entries_off,
+             slots_off, strings_off
+    files    n_files x (name_off, name_len, first_entry, n_entries)
+    entries  n_entries x (key_off, key_len, testid_off, testid_len)
+    slots    n_slots x (hash u64, entry_index + 1 u32), 0 marks an empty slot
+    strings  UTF-8 blob referenced by the offsets above
+
+A testid of None is stored with length 0xFFFFFFFF.
+"""
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterator, Optional
+
+MAGIC = b"HAI3LOC1"
+_HEADER = struct.Struct("<8s7I")
+_FILE = struct.Struct("<4I")
+_ENTRY = struct.Struct("<4I")
+_SLOT = struct.Struct("<QI")
+_NONE = 0xFFFFFFFF
+
+
+def _hash(file_index: int, key: bytes) -> int:
+    """Stable 64-bit hash of (file, key); Python's hash() is salted per process."""
+    digest = hashlib.blake2b(key, digest_size=8, person=file_index.to_bytes(4, "little"))
+    return int.from_bytes(digest.digest(), "little")
+
+
+def compile_store(synced: dict, out_path) -> Path:
+    """
+    Write a compiled store.
+
+    Args:
+        synced: Mapping of resolved yaml path -> {locator_key: testid}
+        out_path: Destination file (written atomically)
+
+    Returns:
+        The path of the written store
+
+    Raises:
+        ValueError: If a key or testid is neither a str nor (for testids) None
+    """
+    out_path = Path(out_path)
+    strings = bytearray()
+    offsets: dict = {}
+
+    def intern(value: Optional[str]) -> tuple:
+        if value is None:
+            return 0, _NONE
+        if not isinstance(value, str):
+            raise ValueError(f"Only strings can be stored, got {value!r}")
+        data = value.encode("utf-8")
+        if data not in offsets:
+            offsets[data] = len(strings)
+            strings.extend(data)
+        return offsets[data], len(data)
+
+    files, entries, hashed = [], [], []
+    for file_index, (name, locators) in enumerate(sorted(synced.items())):
+        name_off, name_len = intern(name)
+        files.append((name_off, name_len, len(entries), len(locators)))
+        for key, testid in locators.items():
+            if not isinstance(key, str):
+                raise ValueError(f"Only string locator keys can be stored, got {key!r}")
+            key_off, key_len = intern(key)
+            entries.append((key_off, key_len, *intern(testid)))
+            hashed.append(_hash(file_index, key.encode("utf-8")))
+
+    n_slots = 1
+    while n_slots < 2 * max(len(entries), 1):
+        n_slots *= 2
+    slots = [(0, 0)] * n_slots
+    for entry_index, h in enumerate(hashed):
+        slot = h & (n_slots - 1)
+        while slots[slot][1]:
+            slot = (slot + 1) & (n_slots - 1)
+        slots[slot] = (h, entry_index + 1)
+
+    files_off = _HEADER.size
+    entries_off = files_off + len(files) * _FILE.size
+    slots_off = entries_off + len(entries) * _ENTRY.size
+    strings_off = slots_off + n_slots * _SLOT.size
+
+    buf = bytearray(_HEADER.pack(MAGIC, len(files), len(entries), n_slots,
+                                 files_off, entries_off, slots_off, strings_off))
+    for record in files:
+        buf += _FILE.pack(*record)
+    for record in entries:
+        buf += _ENTRY.pack(*record)
+    for record in slots:
+        buf += _SLOT.pack(*record)
+    buf += strings
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(bytes(buf))
+    os.replace(tmp, out_path)
+    return out_path
+
+
+class LocatorStore:
+    """Read-only, memory-mapped view of a compiled store."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self._n_files, self._n_entries, self._n_slots, self._files_off,
+         self._entries_off, self._slots_off, self._strings_off) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a compiled locator store: {self.path}")
+        self._files = {}
+        for i in range(self._n_files):
+            name_off, name_len, first, count = _FILE.unpack_from(self._mm, self._files_off + i * _FILE.size)
+            self._files[self._string(name_off, name_len)] = (i, first, count)
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == _NONE:
+            return None
+        start = self._strings_off + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _entry(self, index: int) -> tuple:
+        return _ENTRY.unpack_from(self._mm, self._entries_off + index * _ENTRY.size)
+
+    def __contains__(self, yaml_path: str) -> bool:
+        return yaml_path in self._files
+
+    def files(self) -> list:
+        """Return the resolved yaml paths compiled into the store."""
+        return list(self._files)
+
+    def get_locators(self, yaml_path: str) -> "StoreLocators":
+        """Return the Mapping view for one compiled file."""
+        return StoreLocators(self, *self._files[yaml_path])
+
+    def lookup(self, file_index: int, key: str) -> tuple:
+        """
+        Find a key in one file.
+
+        Returns:
+            (found, testid)
+        """
+        raw = key.encode("utf-8")
+        h = _hash(file_index, raw)
+        mask = self._n_slots - 1
+        slot = h & mask
+        while True:
+            slot_hash, entry_ref = _SLOT.unpack_from(self._mm, self._slots_off + slot * _SLOT.size)
+            if not entry_ref:
+                return False, None
+            if slot_hash == h:
+                key_off, key_len, testid_off, testid_len = self._entry(entry_ref - 1)
+                start = self._strings_off + key_off
+                if self._mm[start:start + key_len] == raw:
+                    return True, self._string(testid_off, testid_len)
+            slot = (slot + 1) & mask
+
+    def close(self) -> None:
+        """Unmap the store file."""
+        self._mm.close()
+
+
+class StoreLocators(Mapping):
+    """locator_key -> testid Mapping backed by a LocatorStore."""
+
+    __slots__ = ("_store", "_file_index", "_first", "_count")
+
+    def __init__(self, store: LocatorStore, file_index: int, first: int, count: int):
+        self._store = store
+        self._file_index = file_index
+        self._first = first
+        self._count = count
+
+    def __getitem__(self, key: str) -> Optional[str]:
+        found, testid = self._store.lookup(self._file_index, key)
+        if not found:
+            raise KeyError(key)
+        return testid
+
+    def get(self, key: str, default=None) -> Optional[str]:
+        found, testid = self._store.lookup(self._file_index, key)
+        return testid if found else default
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._store.lookup(self._file_index, key)[0]
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._first, self._first + self._count):
+            key_off, key_len, _, _ = self._store._entry(index)
+            yield self._store._string(key_off, key_len)
+
+    def __len__(self) -> int:
+        return self._count
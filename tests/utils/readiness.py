@@ -0,0 +1,226 @@
+"""
+App Readiness Strategies
+
+Decide when a page is ready for interaction. Waiting for "networkidle" costs
+500 ms of network silence per navigation and never settles on screens that
+poll or stream, so page objects can instead wait for a signal from the app:
+
+- WindowFlag: a global the app sets once booted (window.__APP_READY__ = true)
+- DomEvent: a custom DOM event the app dispatches on window
+- Responses: a set of API responses that must have arrived
+- DomPredicate: any JavaScript expression that becomes truthy
+
+Strategies that must observe something before it happens are armed by
+BasePage.navigate() before page.goto(). Every strategy also has coroutine
+counterparts (arm_async / wait_async) for AsyncBasePage.
+"""
+import fnmatch
+import functools
+import json
+import os
+import re
+import time
+import weakref
+from typing import Optional, Union
+
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from tests.utils.context_pool import untracked
+
+
+class ReadinessStrategy:
+    """Base class: arm() before navigation, wait() afterwards."""
+
+    def arm(self, page: Page) -> None:
+        """Prepare to observe readiness of the next navigation."""
+
+    def wait(self, page: Page, timeout: int = 30000) -> None:
+        """Block until the page is ready; raise a Playwright TimeoutError otherwise."""
+        raise NotImplementedError
+
+    async def arm_async(self, page) -> None:
+        """arm() for a playwright.async_api Page."""
+
+    async def wait_async(self, page, timeout: int = 30000) -> None:
+        """wait() for a playwright.async_api Page."""
+        raise NotImplementedError
+
+
+class NetworkIdle(ReadinessStrategy):
+    """Wait for 500 ms without network activity (Playwright "networkidle")."""
+
+    def wait(self, page: Page, timeout: int = 30000) -> None:
+        page.wait_for_load_state("networkidle", timeout=timeout)
+
+    async def wait_async(self, page, timeout: int = 30000) -> None:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+
+
+class DomPredicate(ReadinessStrategy):
+    """Wait until a JavaScript expression evaluates truthy in the page."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+
+    def wait(self, page: Page, timeout: int = 30000) -> None:
+        page.wait_for_function(self.expression, timeout=timeout)
+
+    async def wait_async(self, page, timeout: int = 30000) -> None:
+        await page.wait_for_function(self.expression, timeout=timeout)
+
+
+class WindowFlag(DomPredicate):
+    """Wait until the app sets a truthy global, e.g. window.__APP_READY__."""
+
+    def __init__(self, flag: str = "__APP_READY__"):
+        self.flag = flag
+        super().__init__(f"() => Boolean(window[{json.dumps(flag)}])")
+
+
+class DomEvent(WindowFlag):
+    """
+    Wait for a custom event the app dispatches on window.
+
+    An init script turns the event into a window flag, so events fired before
+    wait() is called are not missed.
+    """
+
+    def __init__(self, event: str):
+        self.event = event
+        super().__init__("__readiness_event_" + re.sub(r"\W", "_", event))
+        self._armed = weakref.WeakSet()
+
+    @property
+    def _init_script(self) -> str:
+        return (
+            f"window.addEventListener({json.dumps(self.event)}, "
+            f"() => {{ window[{json.dumps(self.flag)}] = true; }}, {{once: true}});"
+        )
+
+    def arm(self, page: Page) -> None:
+        if page in self._armed:
+            return
+        # Armed once per page, so a pooled page keeps its script for the next test
+        untracked(page.add_init_script)(self._init_script)
+        self._armed.add(page)
+
+    def wait(self, page: Page, timeout: int = 30000) -> None:
+        # Covers later navigations even if this one was not armed
+        self.arm(page)
+        super().wait(page, timeout)
+
+    async def arm_async(self, page) -> None:
+        if page in self._armed:
+            return
+        await page.add_init_script(self._init_script)
+        self._armed.add(page)
+
+    async def wait_async(self, page, timeout: int = 30000) -> None:
+        await self.arm_async(page)
+        await super().wait_async(page, timeout)
+
+
+class Responses(ReadinessStrategy):
+    """
+    Wait until a response matching every pattern has been received.
+
+    Patterns are URL globs ("**/api/v1/user*") or compiled regular expressions.
+    Arming records responses from the next navigation onwards; without it only
+    responses arriving during wait() count.
+    """
+
+    def __init__(self, *patterns: Union[str, "re.Pattern"]):
+        self.patterns = patterns
+        self._seen: "weakref.WeakKeyDictionary[Page, set]" = weakref.WeakKeyDictionary()
+
+    def _match(self, url: str) -> set:
+        return {
+            pattern for pattern in self.patterns
+            if (pattern.search(url) if isinstance(pattern, re.Pattern) else fnmatch.fnmatch(url, pattern))
+        }
+
+    def arm(self, page: Page) -> None:
+        if page not in self._seen:
+            # One listener per page; a pooled page keeps it for the next test
+            untracked(page.on)("response", lambda response: self._seen[page].update(self._match(response.url)))
+        self._seen[page] = set()
+
+    def wait(self, page: Page, timeout: int = 30000) -> None:
+        seen = self._seen.get(page, set())
+        deadline = time.monotonic() + timeout / 1000
+        for pattern in self.patterns:
+            if pattern in seen:
+                continue
+            remaining = max(int((deadline - time.monotonic()) * 1000), 1)
+            page.wait_for_event("response", predicate=lambda r, p=pattern: p in self._match(r.url),
+                                timeout=remaining)
+            seen.add(pattern)
+
+    async def arm_async(self, page) -> None:
+        self.arm(page)
+
+    async def wait_async(self, page, timeout: int = 30000) -> None:
+        seen = self._seen.get(page, set())
+        deadline = time.monotonic() + timeout / 1000
+        for pattern in self.patterns:
+            if pattern in seen:
+                continue
+            remaining = max(int((deadline - time.monotonic()) * 1000), 1)
+            await page.wait_for_event("response", predicate=lambda r, p=pattern: p in self._match(r.url),
+                                      timeout=remaining)
+            seen.add(pattern)
+
+
+class WithFallback(ReadinessStrategy):
+    """Use a primary strategy and fall back to another (networkidle) if it times out."""
+
+    def __init__(self, primary: ReadinessStrategy, fallback: Optional[ReadinessStrategy] = None,
+                 primary_timeout: Optional[int] = None):
+        self.primary = primary
+        self.fallback = fallback or NetworkIdle()
+        self.primary_timeout = primary_timeout
+
+    def arm(self, page: Page) -> None:
+        self.primary.arm(page)
+        self.fallback.arm(page)
+
+    def wait(self, page: Page, timeout: int = 30000) -> None:
+        start = time.monotonic()
+        try:
+            self.primary.wait(page, min(timeout, self.primary_timeout or timeout))
+        except PlaywrightTimeoutError:
+            remaining = timeout - int((time.monotonic() - start) * 1000)
+            self.fallback.wait(page, max(remaining, 1))
+
+    async def arm_async(self, page) -> None:
+        await self.primary.arm_async(page)
+        await self.fallback.arm_async(page)
+
+    async def wait_async(self, page, timeout: int = 30000) -> None:
+        start = time.monotonic()
+        try:
+            await self.primary.wait_async(page, min(timeout, self.primary_timeout or timeout))
+        except PlaywrightTimeoutError:
+            remaining = timeout - int((time.monotonic() - start) * 1000)
+            await self.fallback.wait_async(page, max(remaining, 1))
+
+
+@functools.lru_cache(maxsize=None)
+def default_readiness() -> ReadinessStrategy:
+    """
+    Build the suite-wide readiness strategy from the environment.
+
+    APP_READY_FLAG names a window global and APP_READY_EVENT a window event the
+    app emits when ready; either one falls back to networkidle if the signal
+    does not arrive within APP_READY_TIMEOUT ms (default 10000). Without
+    either, networkidle is used.
+    """
+    flag = os.getenv("APP_READY_FLAG")
+    event = os.getenv("APP_READY_EVENT")
+    if event:
+        primary = DomEvent(event)
+    elif flag:
+        primary = WindowFlag(flag)
+    else:
+        return NetworkIdle()
+    return WithFallback(primary, NetworkIdle(), int(os.getenv("APP_READY_TIMEOUT", "10000")))
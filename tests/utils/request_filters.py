@@ -0,0 +1,149 @@
+"""
+Request Filter Profiles
+
+Abort or stub network requests no assertion depends on (fonts, large images,
+analytics beacons, source maps) to cut navigation time on slow runners.
+
+Profiles are selected per test with ``@pytest.mark.request_filter("lean")``
+or for the whole run with ``--request-filter lean``. Besides the built-in
+profiles below, custom ones can be declared next to the locators in
+tests/locators/request_filters.yaml:
+
+    profiles:
+      no-avatars:
+        resource_types: [image]
+        url_patterns: ["**/avatars/**"]
+        action: abort            # or "stub"
+        stub: {status: 204}      # fulfill() arguments for action "stub"
+
+Bytes saved are an estimate (aborted requests never report a size) based on
+per-resource-type averages, which the YAML may override under
+``estimated_bytes``.
+"""
+import fnmatch
+import time
+from typing import Iterable, Optional
+
+import yaml
+from playwright.sync_api import BrowserContext, Route
+
+from tests.utils.locator_loader import LocatorLoader
+
+PROFILES_YAML = "request_filters.yaml"
+
+# Average transfer sizes used to estimate bytes saved per blocked request
+ESTIMATED_BYTES = {
+    "font": 60_000,
+    "image": 120_000,
+    "media": 1_000_000,
+    "script": 40_000,
+    "stylesheet": 20_000,
+    "xhr": 2_000,
+    "fetch": 2_000,
+    "other": 10_000,
+}
+
+ANALYTICS_PATTERNS = (
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*segment.io/*",
+    "*mixpanel.com/*",
+    "*hotjar.com/*",
+    "*sentry.io/*",
+)
+
+
+class RequestFilterProfile:
+    """A named set of rules matching requests by resource type or URL glob."""
+
+    def __init__(self, name: str, resource_types: Iterable[str] = (),
+                 url_patterns: Iterable[str] = (), action: str = "abort",
+                 stub: Optional[dict] = None):
+        if action not in ("abort", "stub"):
+            raise ValueError(f"Unknown request filter action '{action}' in profile '{name}'")
+        self.name = name
+        self.resource_types = frozenset(resource_types)
+        self.url_patterns = tuple(url_patterns)
+        self.action = action
+        self.stub = stub or {"status": 204, "body": ""}
+
+    def matches(self, resource_type: str, url: str) -> bool:
+        """Check whether a request falls under this profile."""
+        return resource_type in self.resource_types or any(
+            fnmatch.fnmatch(url, pattern) for pattern in self.url_patterns
+        )
+
+
+BUILTIN_PROFILES = {
+    "fonts": RequestFilterProfile("fonts", resource_types=["font"]),
+    "images": RequestFilterProfile("images", resource_types=["image"]),
+    "media": RequestFilterProfile("media", resource_types=["media"]),
+    "analytics": RequestFilterProfile("analytics", url_patterns=ANALYTICS_PATTERNS),
+    "sourcemaps": RequestFilterProfile("sourcemaps", url_patterns=["*.map", "*.map?*"]),
+}
+BUILTIN_PROFILES["lean"] = RequestFilterProfile(
+    "lean",
+    resource_types=["font", "image", "media"],
+    url_patterns=[*ANALYTICS_PATTERNS, "*.map", "*.map?*"],
+)
+
+
+def load_profiles() -> tuple:
+    """
+    Return (profiles, estimated_bytes) merging built-ins with request_filters.yaml.
+    """
+    profiles = dict(BUILTIN_PROFILES)
+    estimated = dict(ESTIMATED_BYTES)
+    path = LocatorLoader.LOCATORS_DIR / PROFILES_YAML
+    if path.exists():
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        for name, spec in (data.get("profiles") or {}).items():
+            profiles[name] = RequestFilterProfile(name, **spec)
+        estimated.update(data.get("estimated_bytes") or {})
+    return profiles, estimated
+
+
+class RequestFilter:
+    """Applies profiles to a browser context and counts what they saved."""
+
+    def __init__(self, profile_names: Iterable[str]):
+        profiles, self.estimated_bytes = load_profiles()
+        unknown = [name for name in profile_names if name not in profiles]
+        if unknown:
+            raise ValueError(f"Unknown request filter profile(s): {', '.join(unknown)}")
+        self.profiles = [profiles[name] for name in dict.fromkeys(profile_names)]
+        self.stats = {
+            "profiles": [profile.name for profile in self.profiles],
+            "blocked": 0,
+            "stubbed": 0,
+            "by_type": {},
+            "estimated_bytes_saved": 0,
+            "handler_ms": 0.0,
+        }
+
+    def install(self, context: BrowserContext) -> "RequestFilter":
+        """Route every request of the context through the filter."""
+        context.route("**/*", self._handle)
+        return self
+
+    def _handle(self, route: Route) -> None:
+        start = time.perf_counter()
+        request = route.request
+        profile = next(
+            (p for p in self.profiles if p.matches(request.resource_type, request.url)), None
+        )
+        if profile is None:
+            route.fallback()
+        else:
+            key = "blocked" if profile.action == "abort" else "stubbed"
+            self.stats[key] += 1
+            by_type = self.stats["by_type"]
+            by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+            self.stats["estimated_bytes_saved"] += self.estimated_bytes.get(
+                request.resource_type, self.estimated_bytes["other"]
+            )
+            if profile.action == "abort":
+                route.abort("blockedbyclient")
+            else:
+                route.fulfill(**profile.stub)
+        self.stats["handler_ms"] += (time.perf_counter() - start) * 1000
@@ -0,0 +1,158 @@
+"""
+Duration-Aware Scheduling
+
+Distributes tests by how long they take instead of by count. Durations from
+earlier runs are kept in pytest's cache (tests/.pytest_cache) and tests are
+packed with longest-processing-time-first: each test, longest first, goes to
+the currently least-loaded bin. That keeps the makespan close to optimal
+whether the bins are xdist workers or CI shards (--shard i/N).
+
+Tests without history are estimated from the mean of their feature file, then
+from the mean of all known tests.
+
+For xdist workers the packing happens in the controller's scheduler
+(DurationScheduling), which sends every worker its whole bin up front.
+"""
+import heapq
+from typing import Iterable, Optional
+
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:
+    # pytest-xdist is optional; DurationScheduling is only built from its hook
+    LoadScheduling = object
+
+CACHE_KEY = "hai3/durations"
+DEFAULT_ESTIMATE = 1.0
+# Weight of the newest run in the moving average
+SMOOTHING = 0.5
+
+
+def history_key(nodeid: str) -> str:
+    """Node id without the "@group" suffix that --dist loadgroup appends."""
+    # Same rule as xdist: an "@" inside a parametrize id is not a group
+    at = nodeid.rfind("@")
+    return nodeid[:at] if at > nodeid.rfind("]") else nodeid
+
+
+def _nodeid(test) -> str:
+    return history_key(test if isinstance(test, str) else test.nodeid)
+
+
+def feature_of(test) -> str:
+    """Return the feature file a test belongs to (its module for plain tests and bare node ids)."""
+    scenario = getattr(getattr(test, "obj", None), "__scenario__", None)
+    feature = getattr(scenario, "feature", None)
+    return getattr(feature, "filename", None) or _nodeid(test).split("::")[0]
+
+
+class DurationHistory:
+    """Per-test durations (seconds) stored in the pytest cache."""
+
+    def __init__(self, config: pytest.Config):
+        # None when pytest runs with -p no:cacheprovider
+        self.cache = getattr(config, "cache", None)
+        self.durations: dict = self.cache.get(CACHE_KEY, {}) if self.cache else {}
+
+    def record(self, nodeid: str, seconds: float) -> None:
+        """Blend a new measurement into the moving average."""
+        nodeid = history_key(nodeid)
+        previous = self.durations.get(nodeid)
+        self.durations[nodeid] = seconds if previous is None else (
+            SMOOTHING * seconds + (1 - SMOOTHING) * previous
+        )
+
+    def save(self) -> None:
+        if self.cache:
+            self.cache.set(CACHE_KEY, self.durations)
+
+    def estimates(self, tests: Iterable) -> dict:
+        """Return {test: seconds} for pytest items or node ids, estimating tests without history."""
+        tests = list(tests)
+        by_feature: dict = {}
+        for test in tests:
+            if _nodeid(test) in self.durations:
+                by_feature.setdefault(feature_of(test), []).append(self.durations[_nodeid(test)])
+        known = list(self.durations.values())
+        fallback = sum(known) / len(known) if known else DEFAULT_ESTIMATE
+
+        result = {}
+        for test in tests:
+            if _nodeid(test) in self.durations:
+                result[test] = self.durations[_nodeid(test)]
+                continue
+            feature = by_feature.get(feature_of(test))
+            result[test] = sum(feature) / len(feature) if feature else fallback
+        return result
+
+
+def lpt_partition(durations: dict, bins: int) -> list:
+    """
+    Pack items into bins, longest first onto the least-loaded bin.
+
+    Args:
+        durations: {item: seconds}
+        bins: Number of bins
+
+    Returns:
+        List of bins, each a list of items in descending duration order
+    """
+    result = [[] for _ in range(bins)]
+    heap = [(0.0, index) for index in range(bins)]
+    ordered = sorted(durations.items(), key=lambda pair: pair[1], reverse=True)
+    for item, seconds in ordered:
+        load, index = heapq.heappop(heap)
+        result[index].append(item)
+        heapq.heappush(heap, (load + seconds, index))
+    return result
+
+
+def parse_shard(value: Optional[str]) -> Optional[tuple]:
+    """Parse "i/N" (1-based) into (i, N)."""
+    if not value:
+        return None
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise pytest.UsageError(f"--shard expects i/N, got '{value}'")
+    if not 1 <= index <= total:
+        raise pytest.UsageError(f"--shard index must be between 1 and {total}, got {index}")
+    return index, total
+
+
+class DurationScheduling(LoadScheduling):
+    """
+    xdist scheduler that sends each worker one longest-first bin of tests up front.
+
+    Within a bin tests keep their collection order, so module and class
+    fixtures are still shared. Tests of a crashed worker go back to the
+    pending list and are handed out as LoadScheduling does.
+    """
+
+    def __init__(self, config: pytest.Config, log=None, history: Optional[DurationHistory] = None):
+        super().__init__(config, log)
+        self.history = history or DurationHistory(config)
+
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+        # Later calls (a replacement worker joined) only hand out pending tests
+        if self.collection is not None:
+            super().schedule()
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        if not self.collection:
+            return
+        index = {nodeid: position for position, nodeid in enumerate(self.collection)}
+        bins = lpt_partition(self.history.estimates(self.collection), len(self.nodes))
+        for node, nodeids in zip(self.nodes, bins):
+            indices = sorted(index[nodeid] for nodeid in nodeids)
+            if indices:
+                self.node2pending[node].extend(indices)
+                node.send_runtest_some(indices)
+            node.shutdown()
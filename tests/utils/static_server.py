@@ -0,0 +1,237 @@
+"""
+Static Server for Production Builds
+
+Serves a built app (Vite's dist/) from an asyncio server on a background
+thread, so tests load bundled, minified assets instead of the dev server's
+on-the-fly transforms.
+
+- Precompressed variants (file.js.br, file.js.gz) are sent when the client
+  accepts them; build them with e.g. vite-plugin-compression.
+- Files up to HOT_FILE_LIMIT bytes are kept in memory after the first request.
+- Content-hashed assets get immutable cache headers, index.html gets no-cache.
+- Unknown paths without a file extension fall back to index.html, so client-side
+  routes can be loaded directly.
+"""
+import asyncio
+import hashlib
+import mimetypes
+import posixpath
+import re
+import threading
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+HOT_FILE_LIMIT = 2 * 1024 * 1024
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Vite names bundles like index-4f3a9c1b.js or index-BxY_8z1Q.css
+HASHED_NAME = re.compile(r"[.-][A-Za-z0-9_-]{8,}\.[a-z0-9]+$")
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+CONTENT_TYPES = {
+    ".js": "text/javascript",
+    ".mjs": "text/javascript",
+    ".css": "text/css",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".wasm": "application/wasm",
+    ".woff2": "font/woff2",
+    ".map": "application/json",
+}
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class StaticServer:
+    """Asyncio HTTP/1.1 server for a directory of built assets."""
+
+    def __init__(self, root, host: str = "127.0.0.1", port: int = 0):
+        self.root = Path(root).resolve()
+        if not (self.root / "index.html").is_file():
+            raise FileNotFoundError(f"No index.html in {self.root}; build the app first")
+        self.host = host
+        self.port = port
+        # path -> (mtime_ns, body, etag)
+        self._hot: dict = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        # Open keep-alive connections, cancelled on stop()
+        self._connections: set = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "StaticServer":
+        """Start serving on a background thread; the port is known when this returns."""
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="static-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            self._server.close()
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "StaticServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until the client closes it."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    writer.write(self._response(400, {}, b"", False))
+                    break
+                method, target, version = parts
+                # A request body left unread would be parsed as the next request
+                framed = "transfer-encoding" not in headers
+                try:
+                    await self._discard_body(reader, int(headers.get("content-length") or 0))
+                except ValueError:
+                    writer.write(self._response(400, {}, b"", False))
+                    break
+                status, response_headers, body = self._resolve(method, target, headers)
+                keep_alive = (framed and version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+                writer.write(self._response(status, response_headers, body if method != "HEAD" else b"",
+                                            keep_alive, len(body)))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _discard_body(reader: asyncio.StreamReader, length: int) -> None:
+        """Skip a Content-Length framed request body without buffering it."""
+        if length < 0:
+            raise ValueError(f"Negative Content-Length {length}")
+        while length:
+            chunk = await reader.read(min(length, 64 * 1024))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", length)
+            length -= len(chunk)
+
+    @staticmethod
+    def _response(status: int, headers: dict, body: bytes, keep_alive: bool,
+                  length: Optional[int] = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+        headers = {
+            **headers,
+            "Date": formatdate(usegmt=True),
+            "Content-Length": str(len(body) if length is None else length),
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    def _resolve(self, method: str, target: str, headers: dict) -> tuple:
+        """Return (status, headers, body) for a request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+
+        path = posixpath.normpath(unquote(urlsplit(target).path))
+        relative = path.lstrip("/")
+        file = (self.root / relative).resolve() if relative not in ("", ".") else self.root / "index.html"
+        if not file.is_relative_to(self.root):
+            return 404, {}, b""
+        if file.is_dir():
+            file = file / "index.html"
+        if not file.is_file():
+            # History API routes have no extension; missing assets stay 404s
+            if posixpath.splitext(path)[1]:
+                return 404, {"Content-Type": "text/plain"}, b"Not Found"
+            file = self.root / "index.html"
+
+        response_headers = {
+            "Content-Type": self._content_type(file),
+            "Cache-Control": self._cache_control(file),
+            "Vary": "Accept-Encoding",
+        }
+        accepted = headers.get("accept-encoding", "")
+        for encoding, suffix in ENCODINGS:
+            variant = file.with_name(file.name + suffix)
+            if encoding in accepted and variant.is_file():
+                response_headers["Content-Encoding"] = encoding
+                file = variant
+                break
+
+        body, etag = self._read(file)
+        response_headers["ETag"] = etag
+        if headers.get("if-none-match") == etag:
+            return 304, response_headers, b""
+        return 200, response_headers, body
+
+    def _read(self, file: Path) -> tuple:
+        """Return (body, etag), from memory when the file is unchanged."""
+        stat = file.stat()
+        cached = self._hot.get(file)
+        if cached and cached[0] == stat.st_mtime_ns:
+            return cached[1], cached[2]
+        body = file.read_bytes()
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        if len(body) <= HOT_FILE_LIMIT:
+            self._hot[file] = (stat.st_mtime_ns, body, etag)
+        return body, etag
+
+    def _cache_control(self, file: Path) -> str:
+        if file.name == "index.html":
+            return "no-cache"
+        if "assets" in file.relative_to(self.root).parts or HASHED_NAME.search(file.name):
+            return IMMUTABLE
+        return "no-cache"
+
+    @staticmethod
+    def _content_type(file: Path) -> str:
+        content_type = CONTENT_TYPES.get(file.suffix) or mimetypes.guess_type(file.name)[0]
+        if content_type is None:
+            return "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/json":
+            return f"{content_type}; charset=utf-8"
+        return content_type
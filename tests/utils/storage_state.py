@@ -0,0 +1,100 @@
+"""
+Storage State Snapshots
+
+Runs the app bootstrap (first load, login, onboarding) once per worker, saves
+Playwright's storage_state (cookies and localStorage, including mock-controller
+preferences) and lets every new context start from it.
+
+Snapshots live in tests/.pytest_cache/storage_state and are keyed by the app
+build, so a new build triggers a fresh bootstrap automatically. The build id
+is APP_BUILD_ID when set. For a production build it is otherwise a hash of
+the app's index HTML (Vite builds reference content-hashed bundles there). A
+dev server's index HTML stays the same whatever the sources say, so there it
+is a hash of the paths, sizes and mtimes of the files in the app's source
+directory (APP_SERVER_CWD), lockfiles included.
+"""
+import hashlib
+import os
+import urllib.request
+from pathlib import Path
+from typing import Callable, Optional
+
+from playwright.sync_api import Browser, Page
+
+STATE_DIR = Path(__file__).parent.parent / ".pytest_cache" / "storage_state"
+# Directories below the source directory that hold no app sources
+IGNORED_DIRS = {"node_modules", "dist", "build", "coverage"}
+
+
+def source_tree_id(root) -> str:
+    """Hash the paths, sizes and mtimes of the files below root (hidden and output directories skipped)."""
+    digest = hashlib.sha256()
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in IGNORED_DIRS)
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            digest.update(f"{os.path.relpath(path, root)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def app_build_id(base_url: str, source_dir: Optional[str] = None) -> str:
+    """
+    Identify the app build served at base_url.
+
+    Args:
+        base_url: App URL, hashed for production builds
+        source_dir: App sources behind a dev server; hashed instead of base_url
+    """
+    build_id = os.getenv("APP_BUILD_ID")
+    if build_id:
+        return build_id
+    if source_dir:
+        return source_tree_id(source_dir)
+    with urllib.request.urlopen(base_url, timeout=10) as response:
+        return hashlib.sha256(response.read()).hexdigest()[:16]
+
+
+def ensure_storage_state(browser: Browser, context_args: dict, base_url: str,
+                         bootstrap: Callable[[Page], None], refresh: bool = False,
+                         source_dir: Optional[str] = None) -> Path:
+    """
+    Return the storage state snapshot for the current build, creating it if needed.
+
+    Args:
+        browser: Browser to run the bootstrap in
+        context_args: Arguments for the bootstrap context (without storage_state)
+        base_url: App URL the bootstrap starts from
+        bootstrap: Called with the page after it loaded base_url
+        refresh: Re-run the bootstrap even if a snapshot exists
+        source_dir: App source directory when base_url is a dev server
+
+    Returns:
+        Path of the storage state JSON file
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    build_id = app_build_id(base_url, source_dir)
+    path = STATE_DIR / f"{build_id}-{worker}.json"
+    if path.exists() and not refresh:
+        return path
+
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    context = browser.new_context(**context_args)
+    try:
+        page = context.new_page()
+        page.goto(base_url)
+        bootstrap(page)
+        tmp = path.with_suffix(".tmp")
+        context.storage_state(path=tmp)
+        os.replace(tmp, path)
+    finally:
+        context.close()
+
+    # Snapshots of older builds are never used again
+    for stale in STATE_DIR.glob(f"*-{worker}.json"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return path
@@ -0,0 +1,184 @@
+"""
+Action Timing Instrumentation
+
+Records how long every page object action and BDD step takes, with its
+target selector, outcome and retry count, into a per-test timeline.
+
+Page object methods are wrapped with @timed. While no timeline is active
+(the default, without --action-timing) the wrapper costs one global lookup.
+Each worker appends finished timelines to TIMING_DIR/<worker>.jsonl and the
+controller merges them into TIMING_DIR/timeline.json at session end.
+
+Open events are tracked per asyncio task (and thread) in a context variable.
+Actions that run concurrently, e.g. AsyncBasePage calls under asyncio.gather,
+are recorded side by side below the step that started them instead of
+nested in each other.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+TIMING_DIR = Path(__file__).parent.parent / ".pytest_cache" / "timings"
+
+_active: Optional["ActionTimeline"] = None
+# Events begun and not yet ended in the current context, outermost first.
+# Tasks copy the context they are created in, so they inherit their parent's
+# open events but keep their own additions to themselves.
+_open: contextvars.ContextVar = contextvars.ContextVar("open_timing_events", default=())
+
+
+class ActionTimeline:
+    """Timed events of one test, in start order."""
+
+    def __init__(self, test_id: str):
+        self.test_id = test_id
+        self.worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        self.origin = time.monotonic()
+        self.events: list = []
+
+    def begin(self, kind: str, action: str, target: Optional[str] = None) -> dict:
+        """Start an event; nested events get a higher depth."""
+        event = {
+            "kind": kind,
+            "action": action,
+            "target": target,
+            "depth": len(_open.get()),
+            "start_ms": (time.monotonic() - self.origin) * 1000,
+            "duration_ms": None,
+            "outcome": None,
+            "retries": 0,
+        }
+        self.events.append(event)
+        _open.set((*_open.get(), event))
+        return event
+
+    def end(self, event: dict, outcome: str = "ok") -> None:
+        """Finish an event started with begin()."""
+        event["duration_ms"] = (time.monotonic() - self.origin) * 1000 - event["start_ms"]
+        event["outcome"] = outcome
+        stack = _open.get()
+        if any(open_event is event for open_event in stack):
+            _open.set(tuple(open_event for open_event in stack if open_event is not event))
+
+    def note_retries(self, retries: int) -> None:
+        """Attach a retry/poll count to the innermost event open in the current task."""
+        stack = _open.get()
+        if stack:
+            stack[-1]["retries"] = retries
+
+    def to_dict(self) -> dict:
+        return {
+            "test": self.test_id,
+            "worker": self.worker,
+            "total_ms": sum(e["duration_ms"] or 0 for e in self.events if e["depth"] == 0),
+            "events": self.events,
+        }
+
+
+def active() -> Optional[ActionTimeline]:
+    """Return the timeline of the running test, if timing is enabled."""
+    return _active
+
+
+def activate(timeline: Optional[ActionTimeline]) -> None:
+    """Make a timeline receive events (None disables recording)."""
+    global _active
+    _active = timeline
+    _open.set(())
+
+
+def note_retries(retries: int) -> None:
+    """Record a retry count on the current action, if timing is enabled."""
+    if _active is not None:
+        _active.note_retries(retries)
+
+
+def timed(func: Callable) -> Callable:
+    """
+    Record a page object method in the active timeline.
+
+    The first positional str argument is recorded as the target. Works for
+    both regular and ``async def`` methods.
+    """
+    action = func.__name__
+
+    def target_of(args: tuple) -> Optional[str]:
+        return args[0] if args and isinstance(args[0], str) else None
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            timeline = _active
+            if timeline is None:
+                return await func(self, *args, **kwargs)
+            event = timeline.begin("action", action, target_of(args))
+            try:
+                result = await func(self, *args, **kwargs)
+            except BaseException as e:
+                timeline.end(event, type(e).__name__)
+                raise
+            timeline.end(event)
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        timeline = _active
+        if timeline is None:
+            return func(self, *args, **kwargs)
+        event = timeline.begin("action", action, target_of(args))
+        try:
+            result = func(self, *args, **kwargs)
+        except BaseException as e:
+            timeline.end(event, type(e).__name__)
+            raise
+        timeline.end(event)
+        return result
+
+    return wrapper
+
+
+def write_timeline(timeline: ActionTimeline, timing_dir: Path = TIMING_DIR) -> None:
+    """Append a finished timeline to this worker's JSON lines file."""
+    timing_dir.mkdir(parents=True, exist_ok=True)
+    with open(timing_dir / f"{timeline.worker}.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(timeline.to_dict()) + "\n")
+
+
+def reset_timelines(timing_dir: Path = TIMING_DIR) -> None:
+    """Remove per-worker files of a previous run."""
+    for path in timing_dir.glob("*.jsonl"):
+        path.unlink(missing_ok=True)
+
+
+def merge_timelines(timing_dir: Path = TIMING_DIR) -> Optional[Path]:
+    """
+    Merge every worker's timelines into timeline.json.
+
+    Returns:
+        The merged file, or None if nothing was recorded
+    """
+    timelines = []
+    for path in sorted(timing_dir.glob("*.jsonl")):
+        with open(path, "r", encoding="utf-8") as f:
+            timelines.extend(json.loads(line) for line in f if line.strip())
+    if not timelines:
+        return None
+
+    totals: dict = {}
+    for timeline in timelines:
+        for event in timeline["events"]:
+            entry = totals.setdefault(event["action"], {"count": 0, "total_ms": 0.0, "failures": 0})
+            entry["count"] += 1
+            entry["total_ms"] += event["duration_ms"] or 0
+            entry["failures"] += event["outcome"] != "ok"
+
+    out = timing_dir / "timeline.json"
+    out.write_text(json.dumps({"by_action": totals, "tests": timelines}, indent=2), encoding="utf-8")
+    return out
@@ -0,0 +1,339 @@
+"""
+Watch Runner
+
+Keeps one interpreter running and, on every change under tests/, re-runs
+only the scenarios the change can affect:
+
+- *.feature: scenarios that were added or whose steps changed
+- step modules: scenarios with a step matched by one of the module's step
+  definitions (before or after the change)
+- page objects and other modules: everything that imports them, followed to
+  the step modules and test modules above
+- locators/*.yaml: the page objects whose LOCATORS_YAML names the file
+- test modules: all their tests
+- conftest.py and every module it imports, directly or not: the whole suite
+
+Changed modules and their importers are dropped from sys.modules before the
+run, changed locator files are reloaded in place, and the browser comes from
+--reuse-browser-server, so nothing else starts cold.
+
+Usage:
+    python -m tests.utils.watch_runner
+    python -m tests.utils.watch_runner --polling -- -x --headed
+"""
+import argparse
+import ast
+import importlib
+import logging
+import queue
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pytest
+from pytest_bdd import feature as bdd_feature
+from pytest_bdd.parser import FeatureParser
+
+from tests.utils.locator_loader import LocatorLoader
+from tests.utils.watcher import FileWatcher, reload_locator_file
+
+logger = logging.getLogger(__name__)
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+STEPS_DIR = TESTS_DIR / "steps"
+WATCHED_PATTERNS = ("*.feature", "*.py", "*.yaml", "*.yml")
+# Wait this long after a change for the rest of an editor save to land
+DEBOUNCE = 0.3
+
+
+def module_name(path: Path) -> str:
+    """Dotted module name of a file below the repository root."""
+    relative = path.resolve().relative_to(TESTS_DIR.parent).with_suffix("")
+    parts = relative.parts[:-1] if relative.name == "__init__" else relative.parts
+    return ".".join(parts)
+
+
+class Selection:
+    """Scenarios and whole test modules to run."""
+
+    def __init__(self):
+        # (absolute feature path, scenario name)
+        self.scenarios: set = set()
+        # Absolute paths of test modules to run completely
+        self.modules: set = set()
+        self.everything = False
+
+    def __bool__(self) -> bool:
+        return self.everything or bool(self.scenarios or self.modules)
+
+    def describe(self) -> str:
+        if self.everything:
+            return "all tests"
+        return f"{len(self.scenarios)} scenario(s), {len(self.modules)} test module(s)"
+
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: list) -> None:
+        """Deselect everything outside the selection."""
+        if self.everything:
+            return
+        keep, drop = [], []
+        for item in items:
+            scenario = getattr(getattr(item, "obj", None), "__scenario__", None)
+            selected = str(item.path) in self.modules or (
+                scenario is not None and (scenario.feature.filename, scenario.name) in self.scenarios
+            )
+            (keep if selected else drop).append(item)
+        if drop:
+            config.hook.pytest_deselected(items=drop)
+        items[:] = keep
+
+
+class DependencyGraph:
+    """What each feature, step, page and locator file is used by."""
+
+    def __init__(self, root: Path = TESTS_DIR):
+        self.root = root
+        # (feature path, scenario name) -> [(step type, step text), ...]
+        self.scenarios: dict = {}
+        # module name -> path, and module name -> imported tests.* modules
+        self.paths: dict = {}
+        self.imports: dict = {}
+        # locator file name -> module names whose LOCATORS_YAML refers to it
+        self.locator_users: dict = {}
+        # step module name -> [StepFunctionContext, ...]
+        self.step_definitions: dict = {}
+
+    def build(self) -> "DependencyGraph":
+        for path in sorted(self.root.rglob("*.feature")):
+            self._add_feature(path)
+        for path in sorted(self.root.rglob("*.py")):
+            if "__pycache__" not in path.parts and ".pytest_cache" not in path.parts:
+                self._add_module(path)
+        for name, path in self.paths.items():
+            if path.parent == STEPS_DIR:
+                self._add_step_definitions(name)
+        return self
+
+    def _add_feature(self, path: Path) -> None:
+        try:
+            feature = FeatureParser(str(path.parent), path.name).parse()
+        except Exception:
+            logger.exception("Could not parse %s", path)
+            return
+        for template in feature.scenarios.values():
+            contexts = [context for examples in template.examples for context in examples.as_contexts()]
+            scenarios = [template.render(context) for context in contexts] or [template]
+            steps = [(step.type, step.name) for scenario in scenarios for step in scenario.steps]
+            self.scenarios[(feature.filename, template.name)] = steps
+
+    def _add_module(self, path: Path) -> None:
+        name = module_name(path)
+        self.paths[name] = path
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+        except (SyntaxError, UnicodeDecodeError):
+            self.imports[name] = set()
+            return
+        imported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imported.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                imported.add(node.module)
+                # "from tests.pages import base_page" imports a submodule
+                imported.update(f"{node.module}.{alias.name}" for alias in node.names)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.Constant):
+                # LOCATORS_YAML = "x.yaml" or LOCATORS_YAML: Optional[str] = "x.yaml"
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                if isinstance(node.value.value, str) and any(
+                    isinstance(t, ast.Name) and t.id == "LOCATORS_YAML" for t in targets
+                ):
+                    self.locator_users.setdefault(Path(node.value.value).name, set()).add(name)
+        self.imports[name] = {module for module in imported if module.startswith("tests.")}
+
+    def _add_step_definitions(self, name: str) -> None:
+        try:
+            module = importlib.import_module(name)
+        except Exception:
+            logger.exception("Could not import step module %s", name)
+            return
+        self.step_definitions[name] = [
+            context
+            for attr in vars(module).values()
+            if (context := getattr(attr, "_pytest_bdd_step_context", None)) is not None
+            and context.step_func.__module__ == name
+        ]
+
+    def importers(self, names: Iterable[str], through_steps: bool = True) -> set:
+        """
+        The given modules plus every module importing them, transitively (conftest excluded).
+
+        With through_steps=False the search stops at step modules: test modules
+        star-import them, but only scenarios using their steps are affected.
+        """
+        result = set(names)
+        pending = [name for name in result if through_steps or not self.is_step_module(name)]
+        while pending:
+            current = pending.pop()
+            for name, imported in self.imports.items():
+                if name in result or name == "tests.conftest":
+                    continue
+                if current in imported or any(m.startswith(current + ".") for m in imported):
+                    result.add(name)
+                    if through_steps or not self.is_step_module(name):
+                        pending.append(name)
+        return result
+
+    def conftest_imports(self) -> set:
+        """Modules the conftest files import, transitively; a change to one can affect any test."""
+        result: set = set()
+        pending = [name for name in self.imports if name.rsplit(".", 1)[-1] == "conftest"]
+        while pending:
+            for imported in self.imports.get(pending.pop(), ()):
+                if imported in self.paths and imported not in result:
+                    result.add(imported)
+                    pending.append(imported)
+        return result
+
+    def is_step_module(self, name: str) -> bool:
+        """Whether a module lives in tests/steps."""
+        path = self.paths.get(name)
+        return path is not None and path.parent == STEPS_DIR
+
+    def scenarios_using(self, step_module: str) -> set:
+        """Scenarios with a step that one of the module's definitions matches."""
+        definitions = self.step_definitions.get(step_module, [])
+        return {
+            key
+            for key, steps in self.scenarios.items()
+            if any(
+                (context.type in (None, step_type)) and context.parser.is_matching(text)
+                for context in definitions
+                for step_type, text in steps
+            )
+        }
+
+    def changed_modules(self, paths: Iterable[Path]) -> set:
+        """Module names touched by changed .py and locator files."""
+        names = set()
+        for path in paths:
+            if path.suffix == ".py":
+                names.add(module_name(path))
+            elif path.suffix in (".yaml", ".yml"):
+                names.update(self.locator_users.get(path.name, ()))
+        return names
+
+
+def affected(changes: Iterable[Path], old: DependencyGraph, new: DependencyGraph) -> Selection:
+    """Map changed files to the tests that depend on them."""
+    selection = Selection()
+    changes = [path.resolve() for path in changes]
+    modules = new.changed_modules(changes) | old.changed_modules(changes)
+    if any(path.name == "conftest.py" for path in changes) or modules & (
+        old.conftest_imports() | new.conftest_imports()
+    ):
+        selection.everything = True
+        return selection
+
+    for path in changes:
+        if path.suffix == ".feature":
+            filename = str(path)
+            selection.scenarios.update(
+                key for key, steps in new.scenarios.items()
+                if key[0] == filename and old.scenarios.get(key) != steps
+            )
+
+    for name in old.importers(modules, through_steps=False) | new.importers(modules, through_steps=False):
+        path = new.paths.get(name) or old.paths.get(name)
+        if path is None:
+            continue
+        if new.is_step_module(name) or old.is_step_module(name):
+            selection.scenarios.update(old.scenarios_using(name) & new.scenarios.keys())
+            selection.scenarios.update(new.scenarios_using(name))
+        elif path.name.startswith("test_"):
+            selection.modules.add(str(path))
+    return selection
+
+
+def purge_modules(names: Iterable[str], graph: DependencyGraph) -> None:
+    """Drop modules, their importers, conftest and all test modules so the next run re-imports them."""
+    stale = graph.importers(names)
+    stale.update(name for name, path in graph.paths.items() if path.name.startswith("test_"))
+    # conftest holds references to page classes and utilities
+    stale.add("tests.conftest")
+    for name in stale:
+        sys.modules.pop(name, None)
+    # scenarios() caches parsed features by path
+    bdd_feature.features.clear()
+
+
+class WatchRunner:
+    """Re-runs affected tests in-process whenever files under tests/ change."""
+
+    def __init__(self, pytest_args: list, interval: float = 0.5, use_polling: bool = False):
+        self.pytest_args = pytest_args
+        self.interval = interval
+        self.use_polling = use_polling
+        self.graph = DependencyGraph().build()
+        self._changes: "queue.Queue[Path]" = queue.Queue()
+
+    def _on_change(self, path: Path) -> None:
+        if "__pycache__" not in path.parts and ".pytest_cache" not in path.parts:
+            self._changes.put(path)
+
+    def _next_batch(self) -> set:
+        """Block until something changes, then collect changes until the tree is quiet."""
+        batch = {self._changes.get()}
+        while True:
+            try:
+                batch.add(self._changes.get(timeout=DEBOUNCE))
+            except queue.Empty:
+                return batch
+
+    def run_once(self, changes: set) -> Optional[int]:
+        """Refresh caches for the changed files and run the affected tests."""
+        old = self.graph
+        changes = {path.resolve() for path in changes}
+        locators_dir = LocatorLoader.LOCATORS_DIR.resolve()
+        for path in changes:
+            if path.suffix in (".yaml", ".yml") and locators_dir in path.parents:
+                reload_locator_file(path)
+        purge_modules({module_name(p) for p in changes if p.suffix == ".py"}, old)
+        self.graph = DependencyGraph().build()
+
+        selection = affected(changes, old, self.graph)
+        names = ", ".join(sorted(path.name for path in changes))
+        if not selection:
+            print(f"\n{names} changed; no tests affected")
+            return None
+        print(f"\n{names} changed; running {selection.describe()}")
+        return pytest.main(self.pytest_args, plugins=[selection])
+
+    def watch(self) -> None:
+        watcher = FileWatcher(TESTS_DIR, self._on_change, patterns=WATCHED_PATTERNS,
+                              interval=self.interval, use_polling=self.use_polling)
+        with watcher:
+            print(f"Watching {TESTS_DIR} ({watcher.backend}); Ctrl+C to stop")
+            while True:
+                self.run_once(self._next_batch())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds")
+    parser.add_argument("--polling", action="store_true", help="Poll mtimes even if watchdog is installed")
+    parser.add_argument("--no-browser-server", action="store_true",
+                        help="Launch a browser per run instead of using --reuse-browser-server")
+    args, pytest_args = parser.parse_known_args()
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+    if not args.no_browser_server:
+        pytest_args = ["--reuse-browser-server", *pytest_args]
+
+    try:
+        WatchRunner([str(TESTS_DIR), *pytest_args], args.interval, args.polling).watch()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+File Watcher Utility
+
+Watches a directory tree and reports changed files. Uses watchdog (inotify on
+Linux) when it is installed and falls back to mtime polling otherwise.
+"""
+import fnmatch
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from tests.utils.locator_loader import LocatorLoader
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+
+class FileWatcher:
+    """Calls a callback with the path of every created, modified or deleted file."""
+
+    def __init__(self, root, callback: Callable[[Path], None],
+                 patterns: tuple = ("*",), interval: float = 0.5,
+                 use_polling: bool = False):
+        """
+        Args:
+            root: Directory to watch recursively
+            callback: Called with the Path of each changed file
+            patterns: Filename globs to report (e.g. "*.yaml")
+            interval: Polling interval in seconds (polling backend only)
+            use_polling: Force mtime polling even if watchdog is installed
+        """
+        self.root = Path(root)
+        self.callback = callback
+        self.patterns = patterns
+        self.interval = interval
+        self.backend = "polling" if use_polling or Observer is None else "watchdog"
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def matches(self, path: Path) -> bool:
+        """Check whether a path matches one of the watched patterns."""
+        return any(fnmatch.fnmatch(path.name, pattern) for pattern in self.patterns)
+
+    def start(self) -> "FileWatcher":
+        """Start watching in a background thread."""
+        if self.backend == "watchdog":
+            self._observer = Observer()
+            self._observer.schedule(_WatchdogHandler(self), str(self.root), recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._poll, name="file-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching and wait for the background thread to exit."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _notify(self, path: Path) -> None:
+        """Invoke the callback, logging instead of killing the watcher on errors."""
+        try:
+            self.callback(path)
+        except Exception:
+            logger.exception("File watcher callback failed for %s", path)
+
+    def _snapshot(self) -> dict:
+        """Return {path: (mtime_ns, size)} for every matching file."""
+        snapshot = {}
+        for path in self.root.rglob("*"):
+            if not self.matches(path):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll(self) -> None:
+        """Polling backend: compare snapshots every interval."""
+        previous = self._snapshot()
+        while not self._stop.wait(self.interval):
+            current = self._snapshot()
+            for path in previous.keys() | current.keys():
+                if previous.get(path) != current.get(path):
+                    self._notify(path)
+            previous = current
+
+
+if Observer is not None:
+    class _WatchdogHandler(FileSystemEventHandler):
+        """Forwards watchdog events for matching files to a FileWatcher."""
+
+        def __init__(self, watcher: FileWatcher):
+            super().__init__()
+            self.watcher = watcher
+
+        def on_any_event(self, event) -> None:
+            if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+                return
+            paths = [event.src_path, getattr(event, "dest_path", "")]
+            for raw in filter(None, paths):
+                path = Path(raw)
+                if self.watcher.matches(path):
+                    self.watcher._notify(path)
+
+
+def reload_locator_file(path: Path) -> None:
+    """Refresh the LocatorLoader caches for one changed locator file."""
+    if path.exists():
+        LocatorLoader.reload(str(path))
+        logger.info("Reloaded locators from %s", path)
+    else:
+        LocatorLoader.invalidate(str(path))
+        logger.info("Dropped locators for deleted file %s", path)
+
+
+def watch_locators(interval: float = 0.5, use_polling: bool = False) -> FileWatcher:
+    """
+    Start hot-reloading tests/locators.
+
+    Only the changed file is re-parsed; already-constructed page objects pick
+    up the new testids because they share the memoized synced maps.
+
+    Returns:
+        The started FileWatcher (call stop() when done)
+    """
+    watcher = FileWatcher(LocatorLoader.LOCATORS_DIR, reload_locator_file,
+                          patterns=("*.yaml", "*.yml"), interval=interval,
+                          use_polling=use_polling)
+    return watcher.start()